@@ -0,0 +1,124 @@
+"""
+Batch Shortest Paths with a Process Pool
+
+This module runs many single-source shortest path searches in parallel. The graph is converted to CSR form once and its
+offsets, targets and weights buffers are copied into `multiprocessing.shared_memory` blocks. Each worker process attaches
+to those blocks when it starts, so the graph is never pickled per task; only the source index goes in and one row of
+distances comes back.
+
+For nearest-facility queries, where only the distance to the closest of many sources matters, use
+`WeightedGraph.getShortestPathFromSources(sources)` instead: it is a single search from a virtual super-source.
+
+Classes:
+    - DistanceMatrix: The costs from each source to every vertex, stored row by row in one `array`.
+
+Functions:
+    - getDistanceMatrix(graph, sources, processes): Runs a search from every source and returns a `DistanceMatrix`.
+
+Usage Example:
+    >>> vertices = ["A", "B", "C", "D"]
+    >>> edges = [[0, 1, 5], [1, 2, 3], [2, 3, 2], [0, 3, 8]]
+    >>> graph = WeightedGraph(vertices, edges)
+    >>> matrix = getDistanceMatrix(graph, [0, 1], processes = 2)
+    >>> matrix.getDistance(0, 2)  # Output: 8.0 (from A to C)
+"""
+
+from array import array
+from multiprocessing import Pool
+from multiprocessing import shared_memory
+
+from .CSRGraph import CSRGraph
+from .CSRGraph import getShortestPathArrays
+
+# The CSR buffers of the graph, attached once per worker process
+workerGraph = {}
+
+class DistanceMatrix:
+    def __init__(self, sources, size):
+        self.sources = sources # The source vertex of each row
+        self.size = size # The number of vertices, i.e. the row length
+        self.distances = array("d", bytes(8 * len(sources) * size))
+
+    # Return the cost from the source of the given row to vertex v
+    def getDistance(self, row, v):
+        return self.distances[row * self.size + v]
+
+    # Return the costs from the source of the given row to all vertices
+    def getRow(self, row):
+        return self.distances[row * self.size : (row + 1) * self.size]
+
+    # Store the costs for the given row
+    def setRow(self, row, costs):
+        self.distances[row * self.size : (row + 1) * self.size] = costs
+
+    # Return the sources, one per row
+    def getSources(self):
+        return self.sources
+
+# Get the costs from every vertex in sources to all vertices of a Graph,
+# WeightedGraph or CSRGraph, using a pool of processes worker processes
+# (all CPUs by default). Unreachable vertices have cost INFINITY
+def getDistanceMatrix(graph, sources, processes = None, chunksize = 16):
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.fromGraph(graph)
+    matrix = DistanceMatrix(sources, graph.getSize())
+
+    if processes == 1:
+        # No pool needed; search in this process
+        for row in range(len(sources)):
+            cost, parent, T = getShortestPathArrays(graph.offsets,
+                graph.targets, graph.weights, [sources[row]])
+            matrix.setRow(row, array("d", cost))
+        return matrix
+
+    blocks = []
+    try:
+        descriptions = []
+        for buffer in (graph.offsets, graph.targets, graph.weights):
+            if buffer is None:
+                descriptions.append(None) # Unweighted graph
+            else:
+                block = shareArray(buffer)
+                blocks.append(block)
+                descriptions.append((block.name,
+                    memoryview(buffer).format, len(buffer)))
+
+        with Pool(processes, initializer = attachGraph,
+                  initargs = descriptions) as pool:
+            rows = pool.imap(getDistanceRow, sources, chunksize)
+            for row, costs in enumerate(rows):
+                matrix.setRow(row, array("d", costs))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return matrix
+
+# Copy an array or memoryview into a new shared memory block
+def shareArray(buffer):
+    size = len(buffer) * buffer.itemsize
+    block = shared_memory.SharedMemory(create = True, size = max(size, 1))
+    block.buf[:size] = memoryview(buffer).cast("B")
+    return block
+
+# Pool initializer: attach to the shared CSR buffers of the graph
+def attachGraph(offsets, targets, weights):
+    views = []
+    for description in (offsets, targets, weights):
+        if description is None:
+            views.append(None)
+        else:
+            name, typecode, length = description
+            block = shared_memory.SharedMemory(name = name)
+            workerGraph.setdefault("blocks", []).append(block)
+            size = length * array(typecode).itemsize
+            views.append(block.buf[:size].cast(typecode))
+    workerGraph["offsets"], workerGraph["targets"], workerGraph["weights"] \
+        = views
+
+# Pool task: return the costs from source to all vertices as bytes
+def getDistanceRow(source):
+    cost, parent, T = getShortestPathArrays(workerGraph["offsets"],
+        workerGraph["targets"], workerGraph["weights"], [source])
+    return array("d", cost).tobytes()
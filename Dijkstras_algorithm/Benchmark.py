@@ -0,0 +1,236 @@
+"""
+Benchmarks for the Graph Algorithms
+
+This script generates synthetic graphs, times the graph algorithms on them and writes one JSON object per measurement,
+so results from two releases can be compared. Every edge is stored in both directions, as in `test_shortest_path`.
+
+Graph generators (each returns vertices and [u, v, w] edges):
+    - randomGraph(n, averageDegree, seed): Uniformly random edges.
+    - gridGraph(rows, columns, seed): A road-like grid with 4 neighbors per vertex.
+    - powerLawGraph(n, edgesPerVertex, seed): Preferential attachment (Barabasi-Albert), with a few high-degree hubs.
+
+Measured operations: bfs, dfs, getShortestPath and getMinimumSpanningTree, for every engine of `WeightedGraph` and for
+`CSRGraph`. The O(V^3) "scan" reference engines only run on graphs with at most --reference-limit vertices. Each
+measurement reports the best time of --repeat runs and the peak memory allocated during one more run under
+`tracemalloc`.
+
+Usage:
+    python -m Dijkstras_algorithm.Benchmark --sizes 1000 10000 --kinds random grid powerlaw --output results.jsonl
+    python -m Dijkstras_algorithm.Benchmark --sizes 1000 10000 --compare results.jsonl  # Exit status 1 on a regression
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from .Dijkstras_list import WeightedGraph
+from .CSRGraph import CSRGraph
+
+# Return n vertices with about n * averageDegree / 2 random undirected edges
+def randomGraph(n, averageDegree = 8, seed = 0, maxWeight = 100):
+    generator = random.Random(seed)
+    edges = []
+    for i in range(n * averageDegree // 2):
+        u = generator.randrange(n)
+        v = generator.randrange(n)
+        if u != v:
+            w = generator.randint(1, maxWeight)
+            edges.append([u, v, w])
+            edges.append([v, u, w])
+    return list(range(n)), edges
+
+# Return a rows x columns grid where each vertex is joined to the vertices
+# to its right and below it
+def gridGraph(rows, columns, seed = 0, maxWeight = 100):
+    generator = random.Random(seed)
+    edges = []
+    for r in range(rows):
+        for c in range(columns):
+            u = r * columns + c
+            neighbors = []
+            if c + 1 < columns:
+                neighbors.append(u + 1)
+            if r + 1 < rows:
+                neighbors.append(u + columns)
+            for v in neighbors:
+                w = generator.randint(1, maxWeight)
+                edges.append([u, v, w])
+                edges.append([v, u, w])
+    return list(range(rows * columns)), edges
+
+# Return a preferential attachment graph: each new vertex is joined to
+# edgesPerVertex existing vertices chosen with probability proportional
+# to their degree
+def powerLawGraph(n, edgesPerVertex = 4, seed = 0, maxWeight = 100):
+    generator = random.Random(seed)
+    edges = []
+    endpoints = [] # Each vertex appears once per edge it has
+    for u in range(n):
+        if u <= edgesPerVertex:
+            targets = set(range(u)) # Start from a small complete graph
+        else:
+            targets = set()
+            while len(targets) < edgesPerVertex:
+                targets.add(generator.choice(endpoints))
+        for v in targets:
+            w = generator.randint(1, maxWeight)
+            edges.append([u, v, w])
+            edges.append([v, u, w])
+            endpoints.append(u)
+            endpoints.append(v)
+    return list(range(n)), edges
+
+# Return the vertices and edges of a generated graph with about n vertices
+def generateGraph(kind, n, seed):
+    if kind == "random":
+        return randomGraph(n, seed = seed)
+    elif kind == "grid":
+        side = max(1, int(math.sqrt(n)))
+        return gridGraph(side, side, seed = seed)
+    elif kind == "powerlaw":
+        return powerLawGraph(n, seed = seed)
+    else:
+        raise ValueError("Unknown graph kind: " + str(kind))
+
+# Return the best time of repeat calls of function and the peak memory
+# allocated during one more call
+def measure(function, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+# Return (representation, operation, engine, function) for every
+# operation to measure on the given graph
+def getOperations(vertices, edges, referenceLimit):
+    graph = WeightedGraph(list(vertices), edges)
+    csr = CSRGraph(list(vertices), edges)
+    operations = [
+        ("WeightedGraph", "bfs", "", lambda: graph.bfs(0)),
+        ("WeightedGraph", "dfs", "", lambda: graph.dfs(0)),
+        ("WeightedGraph", "getShortestPath", "heap",
+            lambda: graph.getShortestPath(0, "heap")),
+        ("WeightedGraph", "getMinimumSpanningTree", "prim",
+            lambda: graph.getMinimumSpanningTree(0, "prim")),
+        ("WeightedGraph", "getMinimumSpanningTree", "kruskal",
+            lambda: graph.getMinimumSpanningTree(0, "kruskal")),
+        ("CSRGraph", "bfs", "", lambda: csr.bfs(0)),
+        ("CSRGraph", "dfs", "", lambda: csr.dfs(0)),
+        ("CSRGraph", "getShortestPath", "heap",
+            lambda: csr.getShortestPath(0)),
+        ("CSRGraph", "getMinimumSpanningTree", "prim",
+            lambda: csr.getMinimumSpanningTree(0)),
+    ]
+    if len(vertices) <= referenceLimit:
+        operations.append(("WeightedGraph", "getShortestPath", "scan",
+            lambda: graph.getShortestPath(0, "scan")))
+        operations.append(("WeightedGraph", "getMinimumSpanningTree",
+            "scan", lambda: graph.getMinimumSpanningTree(0, "scan")))
+    return operations
+
+# Run every operation on every kind and size of graph and return a list of
+# result dictionaries. Each result is also passed to report, if given
+def runBenchmarks(sizes, kinds, repeat = 3, seed = 0, referenceLimit = 300,
+                  report = None):
+    results = []
+    for kind in kinds:
+        for n in sizes:
+            vertices, edges = generateGraph(kind, n, seed)
+            for representation, operation, engine, function in \
+                    getOperations(vertices, edges, referenceLimit):
+                seconds, peakBytes = measure(function, repeat)
+                result = {"graph": kind, "vertices": len(vertices),
+                    "edges": len(edges), "representation": representation,
+                    "operation": operation, "engine": engine,
+                    "seconds": seconds, "peakBytes": peakBytes,
+                    "python": platform.python_version()}
+                results.append(result)
+                if report is not None:
+                    report(result)
+    return results
+
+# Return the key that matches a result with the same measurement in
+# another run
+def getResultKey(result):
+    return (result["graph"], result["vertices"], result["representation"],
+        result["operation"], result["engine"])
+
+# Compare results with a baseline run. Return a list of messages, one for
+# each measurement more than tolerance times slower than in the baseline
+def compareResults(baseline, results, tolerance = 1.25):
+    baselineTimes = {}
+    for result in baseline:
+        baselineTimes[getResultKey(result)] = result["seconds"]
+
+    regressions = []
+    for result in results:
+        before = baselineTimes.get(getResultKey(result))
+        if before is not None and result["seconds"] > before * tolerance:
+            regressions.append(" ".join(str(part) for part in
+                getResultKey(result) if part != "") + ": " + format(before, ".4f")
+                + "s -> " + format(result["seconds"], ".4f") + "s")
+    return regressions
+
+# Read results written by main, one JSON object per line
+def readResults(filename):
+    with open(filename) as file:
+        return [json.loads(line) for line in file if line.strip() != ""]
+
+def main(arguments = None):
+    parser = argparse.ArgumentParser(
+        description = "Benchmark the graph algorithms on synthetic graphs")
+    parser.add_argument("--sizes", type = int, nargs = "+",
+        default = [1000, 10000], help = "numbers of vertices")
+    parser.add_argument("--kinds", nargs = "+",
+        default = ["random", "grid", "powerlaw"],
+        choices = ["random", "grid", "powerlaw"])
+    parser.add_argument("--repeat", type = int, default = 3,
+        help = "timed runs per measurement; the best one is reported")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--reference-limit", type = int, default = 300,
+        help = "largest graph to run the O(V^3) scan engines on")
+    parser.add_argument("--output", help = "write JSON lines to this file "
+        "instead of standard output")
+    parser.add_argument("--compare", help = "baseline JSON lines file; exit "
+        "with status 1 if a measurement is slower by more than --tolerance")
+    parser.add_argument("--tolerance", type = float, default = 1.25)
+    options = parser.parse_args(arguments)
+
+    output = sys.stdout if options.output is None else \
+        open(options.output, "w")
+    try:
+        def report(result):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+        results = runBenchmarks(options.sizes, options.kinds,
+            options.repeat, options.seed, options.reference_limit, report)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if options.compare is not None:
+        regressions = compareResults(readResults(options.compare), results,
+            options.tolerance)
+        for regression in regressions:
+            print("Regression: " + regression, file = sys.stderr)
+        if len(regressions) > 0:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Compressed Sparse Row (CSR) Graph
+
+This module provides a `CSRGraph` class that stores a graph in compressed sparse row form instead of a list of
+`Edge`/`WeightedEdge` objects per vertex. The edges leaving vertex u are targets[offsets[u] .. offsets[u + 1] - 1], with
+the matching weights at the same positions. The three buffers are `array` objects, so an edge costs 4 bytes for its
+target plus 8 bytes for its weight (4 with weightTypecode = "f"), against 100+ bytes for an edge object.
+
+Classes:
+    - CSRGraph: A read-only graph with the same query and search API as `Graph` and `WeightedGraph`.
+
+Key Methods in CSRGraph:
+    - CSRGraph(vertices, edges): Builds the graph from the [u, v] or [u, v, w] edge-list format used by `Graph`.
+    - fromGraph(graph): Converts an existing `Graph` or `WeightedGraph`.
+    - getNeighbors(index): Returns the edges leaving a vertex as `Edge`/`WeightedEdge` objects.
+    - bfs(v), dfs(v): Return a `Tree`.
+    - bfsDistances(v): Returns the BFS level of every vertex in an array.
+    - getShortestPath(sourceVertex): Returns a `ShortestPathTree` (Dijkstra's algorithm with a binary heap).
+    - getMinimumSpanningTree(startingVertex): Returns an `MST` (Prim's algorithm with a binary heap).
+
+Functions:
+    - getShortestPathArrays(offsets, targets, weights, sources): Dijkstra's algorithm directly on CSR buffers.
+
+Usage Example:
+    >>> vertices = ["A", "B", "C", "D"]
+    >>> edges = [[0, 1, 5], [1, 2, 3], [2, 3, 2], [0, 3, 8]]
+    >>> graph = CSRGraph(vertices, edges)
+    >>> graph.getShortestPath(0).getCost(3)  # Output: 8
+"""
+
+from array import array
+import heapq
+
+from .Graph import Tree
+from .Graph import Edge
+from .Graph import getIndices
+from .Graph import getIndexIn
+from .WeightedEdge import WeightedEdge
+from .Queue import DequeQueue
+from .Dijkstras_list import WeightedGraph
+from .Dijkstras_list import MST
+from .Dijkstras_list import ShortestPathTree
+from .Dijkstras_list import INFINITY
+
+class CSRGraph:
+    def __init__(self, vertices = [], edges = [], weightTypecode = "d"):
+        self.vertices = vertices
+        self.indices = getIndices(vertices)
+        self.weightTypecode = weightTypecode
+        self.getCompressedRows(edges)
+
+    # Build the offsets, targets and weights arrays from a list of
+    # [u, v] or [u, v, w] edges. Edges keep their input order per vertex
+    def getCompressedRows(self, edges):
+        n = len(self.vertices)
+        m = len(edges)
+        isWeighted = m > 0 and len(edges[0]) > 2
+
+        # offsets[u + 1] first counts the edges leaving u, then the
+        # prefix sums turn the counts into start positions
+        self.offsets = array("q", bytes(8 * (n + 1)))
+        for edge in edges:
+            self.offsets[edge[0] + 1] += 1
+        for u in range(n):
+            self.offsets[u + 1] += self.offsets[u]
+
+        self.targets = array("i", bytes(4 * m))
+        if isWeighted:
+            self.weights = array(self.weightTypecode,
+                bytes(array(self.weightTypecode).itemsize * m))
+        else:
+            self.weights = None # Unweighted graph
+
+        # Place each edge at the next free position of its source vertex
+        position = self.offsets[:-1]
+        for edge in edges:
+            u = edge[0]
+            p = position[u]
+            self.targets[p] = edge[1]
+            if isWeighted:
+                self.weights[p] = edge[2]
+            position[u] = p + 1
+
+    # Convert a Graph or WeightedGraph into a CSRGraph
+    @staticmethod
+    def fromGraph(graph, weightTypecode = "d"):
+        csr = CSRGraph(graph.vertices, [], weightTypecode)
+        isWeighted = isinstance(graph, WeightedGraph)
+
+        csr.offsets = array("q", [0])
+        csr.targets = array("i")
+        csr.weights = array(weightTypecode) if isWeighted else None
+        for u in range(graph.getSize()):
+            for e in graph.neighbors[u]:
+                csr.targets.append(e.v)
+                if isWeighted:
+                    csr.weights.append(e.weight)
+            csr.offsets.append(len(csr.targets))
+
+        return csr
+
+    # Return the number of vertices in the graph
+    def getSize(self):
+        return len(self.vertices)
+
+    # Return the number of edges in the graph
+    def getNumberOfEdges(self):
+        return len(self.targets)
+
+    # Return True if the edges carry weights
+    def isWeighted(self):
+        return self.weights is not None
+
+    # Return the vertices in the graph
+    def getVertices(self):
+        return self.vertices
+
+    # Return the vertex at the specified index
+    def getVertex(self, index):
+        return self.vertices[index]
+
+    # Return the index for the specified vertex
+    def getIndex(self, v):
+        return getIndexIn(self.indices, v)
+
+    # Return the neighbors of vertex with the specified index as
+    # Edge or WeightedEdge objects, created on demand
+    def getNeighbors(self, index):
+        neighbors = []
+        for i in range(self.offsets[index], self.offsets[index + 1]):
+            if self.weights is None:
+                neighbors.append(Edge(index, self.targets[i]))
+            else:
+                neighbors.append(
+                    WeightedEdge(index, self.targets[i], self.weights[i]))
+        return neighbors
+
+    # Return the indices of the neighbors of the specified vertex
+    def getNeighborIndices(self, index):
+        return self.targets[self.offsets[index] : self.offsets[index + 1]]
+
+    # Return the degree for a specified vertex
+    def getDegree(self, v):
+        index = self.getIndex(v)
+        return self.offsets[index + 1] - self.offsets[index]
+
+    # Return the weight between two vertices
+    def getWeight(self, u, v):
+        indexU = self.getIndex(u)
+        indexV = self.getIndex(v)
+        for i in range(self.offsets[indexU], self.offsets[indexU + 1]):
+            if self.targets[i] == indexV:
+                return 1 if self.weights is None else self.weights[i]
+
+    # Print the edges
+    def printEdges(self):
+        for u in range(self.getSize()):
+            print(str(self.getVertex(u)) + " (" + str(u), end = "): ")
+            for i in range(self.offsets[u], self.offsets[u + 1]):
+                if self.weights is None:
+                    print("(" + str(u) + ", " + str(self.targets[i]),
+                        end = ") ")
+                else:
+                    print("(" + str(u) + ", " + str(self.targets[i])
+                        + ", " + str(self.weights[i]), end = ") ")
+            print()
+
+    # Obtain a DFS tree starting from vertex v. The search uses an
+    # explicit stack and visits vertices in the same order as Graph.dfs
+    def dfs(self, v):
+        offsets = self.offsets
+        targets = self.targets
+
+        searchOrders = [v]
+        parent = self.getSize() * [-1] # Initialize parent[i] to -1
+        isVisited = self.getSize() * [False]
+        isVisited[v] = True
+
+        # Each stack entry is a vertex and the next edge position to try
+        stackVertices = [v]
+        stackPositions = [offsets[v]]
+        while len(stackVertices) > 0:
+            u = stackVertices[-1]
+            i = stackPositions[-1]
+            end = offsets[u + 1]
+            while i < end and isVisited[targets[i]]:
+                i += 1
+
+            if i < end:
+                w = targets[i]
+                stackPositions[-1] = i + 1 # Resume after w later
+                isVisited[w] = True
+                parent[w] = u
+                searchOrders.append(w)
+                stackVertices.append(w)
+                stackPositions.append(offsets[w])
+            else:
+                stackVertices.pop() # All neighbors of u are visited
+                stackPositions.pop()
+
+        return Tree(v, parent, searchOrders, self.vertices)
+
+    # Starting bfs search from vertex v
+    def bfs(self, v):
+        offsets = self.offsets
+        targets = self.targets
+
+        searchOrders = []
+        parent = self.getSize() * [-1] # Initialize parent[i] to -1
+
+        queue = DequeQueue()
+        isVisited = self.getSize() * [False]
+        queue.enqueue(v) # Enqueue v
+        isVisited[v] = True # Mark it visited
+
+        while not queue.isEmpty():
+            u = queue.dequeue() # Dequeue to u
+            searchOrders.append(u) # u searched
+            for i in range(offsets[u], offsets[u + 1]):
+                w = targets[i]
+                if not isVisited[w]:
+                    queue.enqueue(w) # Enqueue w
+                    parent[w] = u # The parent of w is u
+                    isVisited[w] = True # Mark it visited
+
+        return Tree(v, parent, searchOrders, self.vertices)
+
+    # Level-synchronous BFS from vertex v, one frontier at a time. Return
+    # an array with the number of edges on a shortest path from v to each
+    # vertex, or -1 if the vertex cannot be reached
+    def bfsDistances(self, v):
+        offsets = self.offsets
+        targets = self.targets
+
+        distances = array("l", [-1]) * self.getSize()
+        distances[v] = 0
+
+        frontier = [v]
+        level = 0
+        while len(frontier) > 0:
+            level += 1
+            nextFrontier = []
+            for u in frontier:
+                for i in range(offsets[u], offsets[u + 1]):
+                    w = targets[i]
+                    if distances[w] == -1:
+                        distances[w] = level
+                        nextFrontier.append(w)
+            frontier = nextFrontier
+
+        return distances
+
+    # Dijkstra's algorithm with a binary heap. Edges of an unweighted
+    # graph have weight 1
+    def getShortestPath(self, sourceVertex):
+        cost, parent, T = getShortestPathArrays(self.offsets, self.targets,
+            self.weights, [sourceVertex])
+        return ShortestPathTree(sourceVertex, parent, T, cost, self.vertices)
+
+    # Prim's algorithm with a binary heap. Edges of an unweighted graph
+    # have weight 1
+    def getMinimumSpanningTree(self, startingVertex = 0):
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+
+        cost = self.getSize() * [INFINITY]
+        cost[startingVertex] = 0
+        parent = self.getSize() * [-1]
+        totalWeight = 0
+        isInTree = self.getSize() * [False]
+        T = []
+
+        heap = [(0, startingVertex)]
+        while len(heap) > 0:
+            uCost, u = heapq.heappop(heap)
+            if isInTree[u]:
+                continue # Stale entry
+
+            isInTree[u] = True
+            T.append(u)
+            totalWeight += uCost
+
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                w = 1 if weights is None else weights[i]
+                if not isInTree[v] and cost[v] > w:
+                    cost[v] = w
+                    parent[v] = u
+                    heapq.heappush(heap, (w, v))
+
+        return MST(startingVertex, parent, T, totalWeight, self.vertices)
+
+# Dijkstra's algorithm with a binary heap over CSR buffers, which may be
+# arrays or memoryviews. All vertices in sources start with cost 0, as if
+# joined to a virtual super-source. weights may be None for unit weights.
+# Return the cost and parent lists and the vertices in settle order
+def getShortestPathArrays(offsets, targets, weights, sources):
+    size = len(offsets) - 1
+    cost = [INFINITY] * size
+    parent = [-1] * size
+    isSettled = [False] * size
+    T = []
+
+    heap = []
+    for source in sources:
+        cost[source] = 0 # Cost of a source is 0
+        heap.append((0, source))
+    heapq.heapify(heap)
+
+    while len(heap) > 0:
+        uCost, u = heapq.heappop(heap)
+        if isSettled[u]:
+            continue # Stale entry
+
+        isSettled[u] = True
+        T.append(u)
+
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            newCost = uCost + (1 if weights is None else weights[i])
+            if not isSettled[v] and newCost < cost[v]:
+                cost[v] = newCost
+                parent[v] = u
+                heapq.heappush(heap, (newCost, v))
+
+    return cost, parent, T
@@ -0,0 +1,361 @@
+"""
+Contraction Hierarchies
+
+This module preprocesses a `WeightedGraph` into a contraction hierarchy, which answers point-to-point shortest path
+queries while settling only a few hundred vertices, even on country-scale road networks.
+
+Preprocessing contracts the vertices one at a time, least important first. Contracting v removes it from the remaining
+graph. For every path u -> v -> w that may be the only shortest path from u to w, a shortcut edge u -> w is added
+that remembers v as its middle vertex. A local "witness" search from u decides whether another path is no longer than
+u -> v -> w; it gives up after settleLimit vertices, and then the shortcut is added anyway, which is always safe. The
+order in which vertices are contracted is their rank. Vertices are chosen by edge difference (shortcuts added minus
+edges removed) plus the number of its neighbors already contracted and its level; a priority is recomputed when its vertex
+reaches the top of the heap.
+
+A query runs Dijkstra's algorithm from the source over upward edges (towards higher ranks) and from the target over
+downward edges reversed, and the two searches meet at the highest-ranked vertex of the shortest path. The search state
+is kept in dictionaries, so a query costs time for the vertices it settles rather than for the size of the graph.
+Shortcuts on the result are then unpacked into original edges through their middle vertices.
+
+The upward and downward edges are stored in CSR form (offsets, targets, weights and middles buffers), and
+`GraphIO.saveContractionHierarchy` / `GraphIO.loadContractionHierarchy` persist them so the preprocessing runs once.
+
+Classes:
+    - ContractionHierarchy: The preprocessed graph and its queries.
+
+Key Methods in ContractionHierarchy:
+    - fromGraph(graph, settleLimit): Builds the hierarchy of a `WeightedGraph`.
+    - getCost(sourceVertex, targetVertex): Returns the cost of a shortest path, or INFINITY.
+    - getPath(sourceVertex, targetVertex): Returns the vertices of a shortest path from the target back to the source,
+      as `Tree.getPath` does on the tree of `WeightedGraph.getShortestPath(sourceVertex)`.
+    - getShortestPathBetween(sourceVertex, targetVertex): Returns a `ShortestPathTree` holding just that path.
+
+Usage Example:
+    >>> hierarchy = ContractionHierarchy.fromGraph(graph)
+    >>> saveContractionHierarchy(hierarchy, "usa.ch")
+    >>> hierarchy = loadContractionHierarchy("usa.ch")
+    >>> hierarchy.getPath(5, 11)  # Output: ['Houston', 'Dallas', 'Kansas City', 'Chicago']
+"""
+
+from array import array
+import heapq
+
+from .Graph import getIndices
+from .Graph import getIndexIn
+from .Dijkstras_list import ShortestPathTree
+from .Dijkstras_list import INFINITY
+
+class ContractionHierarchy:
+    # upward and downward are (offsets, targets, weights, middles) buffers.
+    # upward holds the edges u -> v with rank[v] > rank[u] at u. downward
+    # holds the edges u -> v with rank[u] > rank[v] at v, with u as target.
+    # A middle of -1 marks an original edge of the graph
+    def __init__(self, vertices, rank, upward, downward):
+        self.vertices = vertices
+        self.indices = getIndices(vertices)
+        self.rank = rank
+        (self.upOffsets, self.upTargets, self.upWeights,
+            self.upMiddles) = upward
+        (self.downOffsets, self.downTargets, self.downWeights,
+            self.downMiddles) = downward
+
+    # Build the contraction hierarchy of a WeightedGraph. Witness searches
+    # stop after settleLimit vertices; a lower limit preprocesses faster
+    # but adds more shortcuts
+    @staticmethod
+    def fromGraph(graph, settleLimit = 500):
+        n = graph.getSize()
+
+        # The remaining graph: outEdges[u][v] and inEdges[v][u] hold the
+        # (weight, middle) of the cheapest edge u -> v
+        outEdges = [{} for i in range(n)]
+        inEdges = [{} for i in range(n)]
+        for u in range(n):
+            for e in graph.neighbors[u]:
+                if e.u != e.v and e.weight < outEdges[u].get(e.v,
+                        (INFINITY, -1))[0]:
+                    outEdges[u][e.v] = (e.weight, -1)
+                    inEdges[e.v][u] = (e.weight, -1)
+
+        contractedNeighbors = n * [0]
+        level = n * [0] # Length of the longest chain of contractions below
+        priority = [getPriority(outEdges, inEdges, v, 0, 0, settleLimit)[0]
+            for v in range(n)]
+        heap = [(priority[v], v) for v in range(n)]
+        heapq.heapify(heap)
+
+        rank = array("i", bytes(4 * n))
+        upward = n * [None]
+        downward = n * [None]
+        isContracted = n * [False]
+        nextRank = 0
+        while len(heap) > 0:
+            vPriority, v = heapq.heappop(heap)
+            if isContracted[v] or vPriority != priority[v]:
+                continue # Stale entry
+
+            # Priorities go stale as neighbors are contracted, so check
+            # that v is still the least important vertex
+            priority[v], shortcuts = getPriority(outEdges, inEdges, v,
+                contractedNeighbors[v], level[v], settleLimit)
+            if len(heap) > 0 and priority[v] > heap[0][0]:
+                heapq.heappush(heap, (priority[v], v))
+                continue
+
+            # Contract v: add its shortcuts and remove it from the graph
+            for u, w, weight in shortcuts:
+                if weight < outEdges[u].get(w, (INFINITY, -1))[0]:
+                    outEdges[u][w] = (weight, v)
+                    inEdges[w][u] = (weight, v)
+            neighbors = set(outEdges[v]) | set(inEdges[v])
+            for w in outEdges[v]:
+                del inEdges[w][v]
+            for u in inEdges[v]:
+                del outEdges[u][v]
+
+            # The edges left at v all lead to vertices contracted later
+            upward[v] = outEdges[v]
+            downward[v] = inEdges[v]
+            outEdges[v] = {}
+            inEdges[v] = {}
+            isContracted[v] = True
+            rank[v] = nextRank
+            nextRank += 1
+
+            for x in neighbors:
+                contractedNeighbors[x] += 1
+                level[x] = max(level[x], level[v] + 1)
+
+        return ContractionHierarchy(graph.vertices, rank,
+            getCompressedEdges(upward), getCompressedEdges(downward))
+
+    # Return the number of vertices in the graph
+    def getSize(self):
+        return len(self.vertices)
+
+    # Return the number of upward and downward edges, shortcuts included
+    def getNumberOfEdges(self):
+        return len(self.upTargets) + len(self.downTargets)
+
+    # Return the vertices in the graph
+    def getVertices(self):
+        return self.vertices
+
+    # Return the vertex at the specified index
+    def getVertex(self, index):
+        return self.vertices[index]
+
+    # Return the index for the specified vertex
+    def getIndex(self, v):
+        return getIndexIn(self.indices, v)
+
+    # Return the position of a vertex in the contraction order
+    def getRank(self, index):
+        return self.rank[index]
+
+    # Bidirectional upward search from sourceVertex to targetVertex.
+    # Return the cost, the meeting vertex (-1 if the target cannot be
+    # reached) and the forward and backward parent dictionaries, which
+    # map a vertex to the previous (next) vertex and the edge's middle
+    def search(self, sourceVertex, targetVertex):
+        forwardCost = {sourceVertex: 0}
+        forwardParent = {sourceVertex: (-1, -1)}
+        forwardHeap = [(0, sourceVertex)]
+        backwardCost = {targetVertex: 0}
+        backwardParent = {targetVertex: (-1, -1)}
+        backwardHeap = [(0, targetVertex)]
+
+        bestCost = INFINITY
+        meetingVertex = -1
+        while len(forwardHeap) > 0 or len(backwardHeap) > 0:
+            isForward = len(backwardHeap) == 0 or (len(forwardHeap) > 0
+                and forwardHeap[0][0] <= backwardHeap[0][0])
+            if isForward:
+                heap, cost, parent = forwardHeap, forwardCost, forwardParent
+                otherCost = backwardCost
+                offsets, targets, weights, middles = (self.upOffsets,
+                    self.upTargets, self.upWeights, self.upMiddles)
+            else:
+                heap, cost, parent = (backwardHeap, backwardCost,
+                    backwardParent)
+                otherCost = forwardCost
+                offsets, targets, weights, middles = (self.downOffsets,
+                    self.downTargets, self.downWeights, self.downMiddles)
+
+            if heap[0][0] >= bestCost:
+                break # Neither search can find a shorter path
+
+            uCost, u = heapq.heappop(heap)
+            if uCost > cost[u]:
+                continue # Stale entry
+
+            if u in otherCost and uCost + otherCost[u] < bestCost:
+                bestCost = uCost + otherCost[u]
+                meetingVertex = u
+
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                newCost = uCost + weights[i]
+                if newCost < cost.get(v, INFINITY):
+                    cost[v] = newCost
+                    parent[v] = (u, middles[i])
+                    heapq.heappush(heap, (newCost, v))
+
+        return bestCost, meetingVertex, forwardParent, backwardParent
+
+    # Return the weight and middle of the edge u -> v in the hierarchy
+    def getEdge(self, u, v):
+        if self.rank[u] < self.rank[v]:
+            for i in range(self.upOffsets[u], self.upOffsets[u + 1]):
+                if self.upTargets[i] == v:
+                    return self.upWeights[i], self.upMiddles[i]
+        else:
+            for i in range(self.downOffsets[v], self.downOffsets[v + 1]):
+                if self.downTargets[i] == u:
+                    return self.downWeights[i], self.downMiddles[i]
+        raise ValueError("(" + str(u) + ", " + str(v)
+            + ") is not an edge of the hierarchy")
+
+    # Return the indices of the vertices on a simple shortest path from
+    # sourceVertex to targetVertex, in that order, and the cost from the
+    # source to each of them. Both lists are empty if there is no path
+    def getPathIndices(self, sourceVertex, targetVertex):
+        bestCost, meetingVertex, forwardParent, backwardParent = \
+            self.search(sourceVertex, targetVertex)
+        if meetingVertex == -1:
+            return [], []
+
+        # The hierarchy edges from the source to the meeting vertex and
+        # on to the target, as (u, v, middle)
+        edges = []
+        v = meetingVertex
+        while forwardParent[v][0] != -1:
+            u, middle = forwardParent[v]
+            edges.append((u, v, middle))
+            v = u
+        edges.reverse()
+        u = meetingVertex
+        while backwardParent[u][0] != -1:
+            v, middle = backwardParent[u]
+            edges.append((u, v, middle))
+            u = v
+
+        # Unpack each shortcut u -> v into u -> middle -> v until only
+        # original edges remain. With zero-weight edges the unpacked path
+        # can return to a vertex at no cost; such loops are cut off, so
+        # the path is simple
+        path = [sourceVertex]
+        costs = [0]
+        positions = {sourceVertex: 0} # Vertex -> its position in path
+        stack = edges[::-1]
+        while len(stack) > 0:
+            u, v, middle = stack.pop()
+            if middle == -1:
+                if v in positions:
+                    end = positions[v] + 1
+                    for x in path[end :]:
+                        del positions[x]
+                    del path[end :]
+                    del costs[end :]
+                else:
+                    positions[v] = len(path)
+                    path.append(v)
+                    costs.append(costs[-1] + self.getEdge(u, v)[0])
+            else:
+                stack.append((middle, v, self.getEdge(middle, v)[1]))
+                stack.append((u, middle, self.getEdge(u, middle)[1]))
+
+        return path, costs
+
+    # Return the cost of a shortest path from sourceVertex to targetVertex,
+    # or INFINITY if there is none
+    def getCost(self, sourceVertex, targetVertex):
+        return self.search(sourceVertex, targetVertex)[0]
+
+    # Return the path of vertices from targetVertex back to sourceVertex,
+    # the same list Tree.getPath(targetVertex) returns for the tree of
+    # WeightedGraph.getShortestPath(sourceVertex). The list is empty if
+    # the target cannot be reached
+    def getPath(self, sourceVertex, targetVertex):
+        path = self.getPathIndices(sourceVertex, targetVertex)[0]
+        return [self.vertices[v] for v in reversed(path)]
+
+    # Return a ShortestPathTree rooted at sourceVertex that holds only the
+    # shortest path to targetVertex, like
+    # WeightedGraph.getShortestPathBetween. Building the tree's lists
+    # takes time proportional to the number of vertices
+    def getShortestPathBetween(self, sourceVertex, targetVertex):
+        path, pathCosts = self.getPathIndices(sourceVertex, targetVertex)
+        parent = self.getSize() * [-1]
+        cost = self.getSize() * [INFINITY]
+        cost[sourceVertex] = 0
+        for i in range(1, len(path)):
+            parent[path[i]] = path[i - 1]
+            cost[path[i]] = pathCosts[i]
+        return ShortestPathTree(sourceVertex, parent, path, cost,
+            self.vertices)
+
+# Return the priority of contracting v, lower first, and the shortcuts it
+# needs. The priority is the edge difference, i.e. the shortcuts added
+# minus the edges removed, plus the number of neighbors already contracted
+# and the level of v, which spread the contractions evenly over the graph
+def getPriority(outEdges, inEdges, v, contractedNeighbors, level,
+                settleLimit):
+    shortcuts = getShortcuts(outEdges, inEdges, v, settleLimit)
+    return (len(shortcuts) - len(outEdges[v]) - len(inEdges[v])
+        + contractedNeighbors + level), shortcuts
+
+# Return the shortcuts (u, w, weight) needed to contract v: one for each
+# path u -> v -> w with no witness path from u to w that avoids v and is
+# no longer. A witness search settles at most settleLimit vertices
+def getShortcuts(outEdges, inEdges, v, settleLimit):
+    shortcuts = []
+    for u, (uWeight, uMiddle) in inEdges[v].items():
+        targets = set(outEdges[v])
+        targets.discard(u)
+        if len(targets) == 0:
+            continue # v only leads back to u
+        maxCost = uWeight + max(outEdges[v][w][0] for w in targets)
+
+        # Dijkstra's algorithm from u in the remaining graph without v,
+        # until every target is settled or the cost passes the longest
+        # path through v
+        cost = {u: 0}
+        heap = [(0, u)]
+        settled = 0
+        while len(heap) > 0 and settled < settleLimit:
+            xCost, x = heapq.heappop(heap)
+            if xCost > cost[x]:
+                continue # Stale entry
+            if xCost > maxCost:
+                break
+            settled += 1
+            if x in targets:
+                targets.remove(x)
+                if len(targets) == 0:
+                    break
+            for y, (yWeight, yMiddle) in outEdges[x].items():
+                newCost = xCost + yWeight
+                if y != v and newCost < cost.get(y, INFINITY):
+                    cost[y] = newCost
+                    heapq.heappush(heap, (newCost, y))
+
+        for w, (wWeight, wMiddle) in outEdges[v].items():
+            if w != u and cost.get(w, INFINITY) > uWeight + wWeight:
+                shortcuts.append((u, w, uWeight + wWeight))
+    return shortcuts
+
+# Return the offsets, targets, weights and middles buffers of a list with
+# one {target: (weight, middle)} dictionary per vertex
+def getCompressedEdges(edges):
+    offsets = array("q", [0])
+    targets = array("i")
+    weights = array("d")
+    middles = array("i")
+    for vertexEdges in edges:
+        for v, (weight, middle) in vertexEdges.items():
+            targets.append(v)
+            weights.append(weight)
+            middles.append(middle)
+        offsets.append(len(targets))
+    return offsets, targets, weights, middles
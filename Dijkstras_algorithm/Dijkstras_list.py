@@ -7,12 +7,26 @@ Classes:
     - WeightedGraph: Extends the `Graph` class to include weighted edges and additional graph algorithms.
     - MST: Represents the Minimum Spanning Tree as a subclass of `Tree`.
     - ShortestPathTree: Represents the result of Dijkstra's algorithm as a subclass of `Tree`.
+      getCostArray() returns all costs at once and writeAllPaths(file) writes every path in blocks of lines.
 
 Key Methods in WeightedGraph:
     - addEdge(u, v, w): Adds a weighted edge between vertices `u` and `v` with weight `w`.
+    - addEdges(edges): Adds a batch of (u, v, w) edges given by vertex labels in linear time.
     - getWeight(u, v): Retrieves the weight of the edge between vertices `u` and `v`.
-    - getMinimumSpanningTree(startingVertex): Computes the MST using Prim's algorithm.
-    - getShortestPath(sourceVertex): Computes the shortest paths from a source vertex using Dijkstra's algorithm.
+    - setWeight(u, v, w): Changes the weight of the edge between vertices `u` and `v`.
+      Both use an edge index built on first use and discarded when edges are added.
+    - getMinimumSpanningTree(startingVertex, engine): Computes the MST.
+      engine is "prim" (Prim's algorithm with a binary heap, the default), "kruskal" (Kruskal's algorithm with a
+      union-find) or "scan" (the original O(V^3) Prim's reference implementation).
+    - getShortestPathBetween(sourceVertex, targetVertex, bidirectional): Computes the shortest path between two vertices,
+      stopping once the target is settled. bidirectional = True also searches backward from the target.
+    - getShortestPathAStar(sourceVertex, targetVertex, heuristic, coordinates): Computes the shortest path between two
+      vertices with A* search, guided by a heuristic callable or by per-vertex coordinates ("euclidean" or "haversine").
+    - getShortestPathFromSources(sources): Computes the cost from the nearest of several sources to every vertex.
+    - getShortestPath(sourceVertex, engine): Computes the shortest paths from a source vertex using Dijkstra's algorithm.
+      engine is "heap" (binary heap, the default) or "scan" (the original O(V^3) reference implementation).
+    - updateShortestPath(tree, u, v): Repairs a `ShortestPathTree` in place after edge (u, v) was added or made cheaper.
+    - enableShortestPathCache(maxEntries, maxBytes): Caches the trees returned by getShortestPath until the graph changes.
 
 Usage Example:
     >>> vertices = ["A", "B", "C", "D"]
@@ -24,15 +38,23 @@ Usage Example:
     >>> shortest_path_tree.printAllPaths()  # Prints shortest paths from the source
 """
 
-from Graph import Graph
-from Graph import Tree
-from WeightedEdge import WeightedEdge
+from array import array
+import heapq
+import sys
+
+from .Graph import Graph
+from .Graph import Tree
+from .WeightedEdge import WeightedEdge
+from .UnionFind import UnionFind
+from . import Heuristics
+from .ShortestPathCache import ShortestPathCache
 
 INFINITY = 1e+308 # Infinity value
 
 class WeightedGraph(Graph):
     def __init__(self, vertices = [], edges = []):
         super().__init__(vertices, edges)
+        self.shortestPathCache = None # See enableShortestPathCache
 
     # Override this method in the Graph class
     def getAdjacnecyLists(self, edges):
@@ -59,23 +81,149 @@ class WeightedGraph(Graph):
                       + ", "  + str(edge.weight), end = ") ")
             print()
 
-    # Return the weight between two vertices
+    # Return the weight between two vertices, or None if there is no edge
     def getWeight(self, u, v):
-        for edge in self.neighbors[self.getIndex(u)]:
-            if edge.v == self.getIndex(v):
-                return edge.weight
+        edge = self.getEdge(u, v)
+        if edge is not None:
+            return edge.weight
+
+    # Change the weight of the edge between two vertices
+    # Return False if there is no such edge
+    def setWeight(self, u, v, w):
+        edge = self.getEdge(u, v)
+        if edge is None:
+            return False
+        edge.weight = w
+        self.version += 1 # The edge index stays valid
+        return True
+
+    # Cache the trees returned by getShortestPath, keeping at most
+    # maxEntries of them and, if maxBytes is given, about that much
+    # memory. The cache is dropped whenever the graph changes
+    def enableShortestPathCache(self, maxEntries = 128, maxBytes = None):
+        self.shortestPathCache = ShortestPathCache(maxEntries, maxBytes)
+
+    # Stop caching shortest path trees
+    def disableShortestPathCache(self):
+        self.shortestPathCache = None
+
+    # Return the shortest path cache, or None if caching is disabled
+    def getShortestPathCache(self):
+        return self.shortestPathCache
   
     # Override the addEdge method to add a weighted edge 
     def addEdge(self, u, v, w):
-        if u in self.vertices and v in self.vertices:
-            indexU = self.getIndex(u)
-            indexV = self.getIndex(v)
+        if u in self.indices and v in self.indices:
+            indexU = self.indices[u]
+            indexV = self.indices[v]
             # Add an edge (u, v, w) to the graph
             self.neighbors[indexU].append(
                 WeightedEdge(indexU, indexV, w))
+            self.edgesChanged()
+
+    # Override the addEdges method to add a batch of (u, v, w) edges
+    # given by vertex labels in linear time
+    def addEdges(self, edges):
+        indices = self.indices
+        neighbors = self.neighbors
+        for u, v, w in edges:
+            indexU = indices.get(u)
+            indexV = indices.get(v)
+            if indexU is not None and indexV is not None:
+                neighbors[indexU].append(WeightedEdge(indexU, indexV, w))
+        self.edgesChanged()
+
+    # Get a minimum spanning tree rooted at the specified vertex.
+    # engine selects the implementation: "prim" (default) is Prim's
+    # algorithm with a binary heap, "kruskal" is Kruskal's algorithm with
+    # a union-find, and "scan" is the original reference version
+    def getMinimumSpanningTree(self, startingVertex = 0, engine = "prim"):
+        if engine == "prim":
+            return self.getMinimumSpanningTreePrim(startingVertex)
+        elif engine == "kruskal":
+            return self.getMinimumSpanningTreeKruskal(startingVertex)
+        elif engine == "scan":
+            return self.getMinimumSpanningTreeScan(startingVertex)
+        else:
+            raise ValueError("Unknown spanning tree engine: " + str(engine))
+
+    # Prim's algorithm with a binary heap and lazy deletion, O(E log V)
+    def getMinimumSpanningTreePrim(self, startingVertex = 0):
+        # cost[v] stores the cost by adding v to the tree
+        cost = self.getSize() * [INFINITY]
+        cost[startingVertex] = 0 # Cost of source is 0
 
-    # Get a minimum spanning tree rooted at the specified vertex
-    def getMinimumSpanningTree(self, startingVertex = 0):
+        parent = self.getSize() * [-1] # Parent of a vertex
+        totalWeight = 0 # Total weight of the tree thus far
+
+        isInTree = self.getSize() * [False]
+        T = []
+
+        # The heap holds (cost, vertex) pairs; entries for vertices
+        # already in the tree are stale and skipped
+        heap = [(0, startingVertex)]
+        while len(heap) > 0:
+            uCost, u = heapq.heappop(heap)
+            if isInTree[u]:
+                continue # Stale entry
+
+            isInTree[u] = True
+            T.append(u) # Add a new vertex to T
+            totalWeight += uCost # Add cost[u] to the tree
+
+            # Adjust cost[v] for v that is adjacent to u and v in V - T
+            for e in self.neighbors[u]:
+                if not isInTree[e.v] and cost[e.v] > e.weight:
+                    cost[e.v] = e.weight
+                    parent[e.v] = u
+                    heapq.heappush(heap, (e.weight, e.v))
+
+        return MST(startingVertex, parent, T, totalWeight,
+            self.vertices)
+
+    # Kruskal's algorithm with a union-find, O(E log E). Edges are
+    # treated as undirected. The spanning tree of the component containing
+    # startingVertex is returned, rooted at startingVertex
+    def getMinimumSpanningTreeKruskal(self, startingVertex = 0):
+        edges = []
+        for u in range(self.getSize()):
+            for e in self.neighbors[u]:
+                edges.append((e.weight, e.u, e.v))
+        edges.sort()
+
+        # Pick the cheapest edges that join two different trees
+        sets = UnionFind(self.getSize())
+        treeNeighbors = [[] for i in range(self.getSize())]
+        for w, u, v in edges:
+            if sets.union(u, v):
+                treeNeighbors[u].append((v, w))
+                treeNeighbors[v].append((u, w))
+                if sets.getNumberOfSets() == 1:
+                    break # All vertices are connected
+
+        # Orient the tree from startingVertex to fill in parent and T
+        parent = self.getSize() * [-1]
+        totalWeight = 0
+        isInTree = self.getSize() * [False]
+        isInTree[startingVertex] = True
+        T = [startingVertex]
+        i = 0
+        while i < len(T):
+            u = T[i]
+            i += 1
+            for v, w in treeNeighbors[u]:
+                if not isInTree[v]:
+                    isInTree[v] = True
+                    parent[v] = u
+                    totalWeight += w
+                    T.append(v)
+
+        return MST(startingVertex, parent, T, totalWeight,
+            self.vertices)
+
+    # Original Prim's algorithm: a linear scan for the smallest cost vertex
+    # on each step. Kept as a reference for correctness comparison
+    def getMinimumSpanningTreeScan(self, startingVertex = 0):
         # cost[v] stores the cost by adding v to the tree
         cost = self.getSize() * [INFINITY]
         cost[startingVertex] = 0 # Cost of source is 0
@@ -110,7 +258,279 @@ class WeightedGraph(Graph):
         return MST(startingVertex, parent, T, totalWeight, 
             self.vertices)
 
-    def getShortestPath(self, sourceVertex):
+    # Get the shortest paths from sourceVertex to all other vertices.
+    # engine selects the implementation: "heap" (default) is Dijkstra's
+    # algorithm with a binary heap, "scan" is the original reference version
+    # If the cache is enabled, a cached tree is returned when the graph has
+    # not changed since it was computed. Cached trees are shared between
+    # callers and must not be modified
+    def getShortestPath(self, sourceVertex, engine = "heap"):
+        cache = self.shortestPathCache
+        if cache is not None:
+            tree = cache.get((sourceVertex, engine), self.version)
+            if tree is not None:
+                return tree
+
+        if engine == "heap":
+            tree = self.getShortestPathHeap(sourceVertex)
+        elif engine == "scan":
+            tree = self.getShortestPathScan(sourceVertex)
+        else:
+            raise ValueError("Unknown shortest path engine: " + str(engine))
+
+        if cache is not None:
+            cache.put((sourceVertex, engine), tree, self.version)
+        return tree
+
+    # Dijkstra's algorithm with a binary heap and lazy deletion,
+    # O((V + E) log V). If targetVertex is given, the search stops as soon
+    # as it is settled; only the vertices in T then have final costs
+    def getShortestPathHeap(self, sourceVertex, targetVertex = -1):
+        return self.getShortestPathFromSources([sourceVertex], targetVertex)
+
+    # Multi-source Dijkstra's algorithm: every vertex in sources starts
+    # with cost 0, as if joined to a virtual super-source. The cost of a
+    # vertex is the cost from its nearest source, and the last vertex of
+    # getPath(v) on the result is that source. The tree is rooted at
+    # sources[0]
+    def getShortestPathFromSources(self, sources, targetVertex = -1):
+        # cost[v] stores the cost of the path from v to the source
+        cost = [INFINITY] * self.getSize()
+
+        # parent[v] stores the previous vertex of v in the path
+        parent = [-1] * self.getSize()
+
+        # isSettled[v] is True once the shortest path to v is known
+        isSettled = [False] * self.getSize()
+
+        # T stores the vertices whose path found so far, in settle order
+        T = []
+
+        # The heap holds (cost, vertex) pairs. A vertex may appear more than
+        # once; entries for settled vertices are stale and skipped
+        heap = []
+        for source in sources:
+            cost[source] = 0 # Cost of a source is 0
+            heap.append((0, source))
+        heapq.heapify(heap)
+
+        while len(heap) > 0:
+            uCost, u = heapq.heappop(heap)
+            if isSettled[u]:
+                continue # Stale entry
+
+            isSettled[u] = True
+            T.append(u) # Add u to T
+            if u == targetVertex:
+                break # The path to the target is known
+
+            # Relax the edges leaving u
+            for e in self.neighbors[u]:
+                newCost = uCost + e.weight
+                if not isSettled[e.v] and newCost < cost[e.v]:
+                    cost[e.v] = newCost
+                    parent[e.v] = u
+                    heapq.heappush(heap, (newCost, e.v))
+
+        # Create a ShortestPathTree
+        return ShortestPathTree(sources[0], parent, T, cost, self.vertices)
+
+    # Get the shortest path from sourceVertex to targetVertex, searching
+    # only until the target is settled. With bidirectional = True, a
+    # search from the target over the reversed edges runs at the same time
+    def getShortestPathBetween(self, sourceVertex, targetVertex,
+                               bidirectional = False):
+        if bidirectional:
+            return self.getShortestPathBidirectional(sourceVertex,
+                targetVertex)
+        else:
+            return self.getShortestPathHeap(sourceVertex, targetVertex)
+
+    # Bidirectional Dijkstra's algorithm. The forward search grows from
+    # the source and the backward search from the target, and the side
+    # with the smaller heap top is expanded. The search stops once the
+    # two heap tops add up to at least the best path found so far.
+    # T holds the vertices settled by either search. The returned tree
+    # has final costs for the vertices settled by the forward search
+    # and for the vertices on the path to the target
+    def getShortestPathBidirectional(self, sourceVertex, targetVertex):
+        reverseNeighbors = self.getReverseAdjacencyLists()
+
+        # Forward search state: the cost from the source and the parent
+        forwardCost = [INFINITY] * self.getSize()
+        forwardCost[sourceVertex] = 0
+        parent = [-1] * self.getSize()
+        isForwardSettled = [False] * self.getSize()
+        forwardHeap = [(0, sourceVertex)]
+
+        # Backward search state: the cost to the target and the next
+        # vertex on the path to the target
+        backwardCost = [INFINITY] * self.getSize()
+        backwardCost[targetVertex] = 0
+        successor = [-1] * self.getSize()
+        isBackwardSettled = [False] * self.getSize()
+        backwardHeap = [(0, targetVertex)]
+
+        T = []
+        bestCost = INFINITY # Cost of the best path found so far
+        meetingVertex = -1 # Where the best path crosses from one search
+        if sourceVertex == targetVertex:
+            bestCost = 0
+            meetingVertex = sourceVertex
+            T.append(sourceVertex) # Found without expanding either side
+
+        while len(forwardHeap) > 0 and len(backwardHeap) > 0:
+            if forwardHeap[0][0] + backwardHeap[0][0] >= bestCost:
+                break # No shorter path is possible
+
+            if forwardHeap[0][0] <= backwardHeap[0][0]:
+                uCost, u = heapq.heappop(forwardHeap)
+                if isForwardSettled[u]:
+                    continue # Stale entry
+                isForwardSettled[u] = True
+                if not isBackwardSettled[u]:
+                    T.append(u)
+
+                for e in self.neighbors[u]:
+                    newCost = uCost + e.weight
+                    if newCost < forwardCost[e.v]:
+                        forwardCost[e.v] = newCost
+                        parent[e.v] = u
+                        heapq.heappush(forwardHeap, (newCost, e.v))
+                    if forwardCost[e.v] + backwardCost[e.v] < bestCost:
+                        bestCost = forwardCost[e.v] + backwardCost[e.v]
+                        meetingVertex = e.v
+            else:
+                uCost, u = heapq.heappop(backwardHeap)
+                if isBackwardSettled[u]:
+                    continue # Stale entry
+                isBackwardSettled[u] = True
+                if not isForwardSettled[u]:
+                    T.append(u)
+
+                for e in reverseNeighbors[u]:
+                    newCost = uCost + e.weight
+                    if newCost < backwardCost[e.u]:
+                        backwardCost[e.u] = newCost
+                        successor[e.u] = u
+                        heapq.heappush(backwardHeap, (newCost, e.u))
+                    if forwardCost[e.u] + backwardCost[e.u] < bestCost:
+                        bestCost = forwardCost[e.u] + backwardCost[e.u]
+                        meetingVertex = e.u
+
+        # Join the backward half of the path onto the forward tree
+        cost = forwardCost
+        if meetingVertex != -1:
+            v = meetingVertex
+            while v != targetVertex:
+                parent[successor[v]] = v
+                cost[successor[v]] = bestCost - backwardCost[successor[v]]
+                v = successor[v]
+
+        return ShortestPathTree(sourceVertex, parent, T, cost, self.vertices)
+
+    # A* search from sourceVertex to targetVertex. heuristic(v, target)
+    # estimates the cost from v to the target and must never overestimate
+    # it. Instead of a callable, per-vertex coordinates can be given with
+    # heuristic set to "euclidean" (the default) or "haversine". Other
+    # names, or neither a heuristic nor coordinates, raise ValueError.
+    # T holds the settled vertices, so getNumberOfVerticesFound() on the
+    # result reports how much of the graph was explored
+    def getShortestPathAStar(self, sourceVertex, targetVertex,
+                             heuristic = None, coordinates = None):
+        if isinstance(heuristic, str) and \
+                heuristic not in ("euclidean", "haversine"):
+            raise ValueError("Unknown heuristic: " + heuristic)
+        if coordinates is not None:
+            if heuristic is None or heuristic == "euclidean":
+                heuristic = Heuristics.euclidean(coordinates)
+            elif heuristic == "haversine":
+                heuristic = Heuristics.haversine(coordinates)
+        if heuristic is None or isinstance(heuristic, str):
+            raise ValueError("A* needs a heuristic callable or coordinates")
+
+        cost = [INFINITY] * self.getSize()
+        cost[sourceVertex] = 0
+        parent = [-1] * self.getSize()
+        isSettled = [False] * self.getSize()
+        T = []
+
+        # The heap holds (cost + estimate, cost, vertex) triples. An entry
+        # whose cost is higher than cost[vertex] is stale and skipped
+        heap = [(heuristic(sourceVertex, targetVertex), 0, sourceVertex)]
+        while len(heap) > 0:
+            estimate, uCost, u = heapq.heappop(heap)
+            if uCost > cost[u]:
+                continue # Stale entry
+
+            if not isSettled[u]:
+                isSettled[u] = True
+                T.append(u)
+            if u == targetVertex:
+                break # The path to the target is known
+
+            for e in self.neighbors[u]:
+                newCost = uCost + e.weight
+                if newCost < cost[e.v]:
+                    cost[e.v] = newCost
+                    parent[e.v] = u
+                    heapq.heappush(heap, (newCost
+                        + heuristic(e.v, targetVertex), newCost, e.v))
+
+        return ShortestPathTree(sourceVertex, parent, T, cost, self.vertices)
+
+    # Repair a ShortestPathTree of this graph in place after the edge from
+    # vertex index u to vertex index v was added or its weight decreased.
+    # Only the vertices whose cost goes down are visited, so the work is
+    # proportional to the changed region. A weight increase can make
+    # paths longer and needs a new getShortestPath instead. The tree must
+    # not be one shared through the shortest path cache.
+    # Return the number of vertices whose cost changed
+    def updateShortestPath(self, tree, u, v):
+        cost = tree.costs
+        parent = tree.parent
+
+        # Cover vertices added since the tree was computed
+        if len(cost) < self.getSize():
+            tree.depths = None
+        while len(cost) < self.getSize():
+            cost.append(INFINITY)
+            parent.append(-1)
+
+        # Start from the changed edge, then propagate like Dijkstra's
+        # algorithm through the vertices that become cheaper
+        heap = []
+        for e in self.neighbors[u]:
+            if e.v == v and cost[u] + e.weight < cost[v]:
+                if cost[v] == INFINITY:
+                    tree.searchOrders.append(v) # Newly reachable
+                cost[v] = cost[u] + e.weight
+                parent[v] = u
+                heap.append((cost[v], v))
+
+        numberOfChanges = 0
+        while len(heap) > 0:
+            xCost, x = heapq.heappop(heap)
+            if xCost > cost[x]:
+                continue # Stale entry
+            numberOfChanges += 1
+
+            for e in self.neighbors[x]:
+                newCost = xCost + e.weight
+                if newCost < cost[e.v]:
+                    if cost[e.v] == INFINITY:
+                        tree.searchOrders.append(e.v) # Newly reachable
+                    cost[e.v] = newCost
+                    parent[e.v] = x
+                    heapq.heappush(heap, (newCost, e.v))
+
+        if numberOfChanges > 0:
+            tree.depths = None # The memoized depths are out of date
+        return numberOfChanges
+
+    # Original Dijkstra's algorithm: rescan the edges of every vertex in T
+    # on each expansion. Kept as a reference for correctness comparison
+    def getShortestPathScan(self, sourceVertex):
         # cost[v] stores the cost of the path from v to the source
         cost = [INFINITY] * self.getSize()  # Initial cost to infinity
         cost[sourceVertex] = 0  # Cost of source is 0
@@ -168,13 +588,39 @@ class ShortestPathTree(Tree):
     def getCost(self, v):
         return self.costs[v]
 
+    # Return the costs of all vertices, as a NumPy array if NumPy is
+    # installed and as an array of doubles otherwise
+    def getCostArray(self):
+        try:
+            import numpy
+        except ImportError:
+            return array("d", self.costs)
+        return numpy.array(self.costs, dtype = numpy.float64)
+
     # Print paths from all vertices to the source 
     def printAllPaths(self):
-        print("All shortest paths from " 
-            + str(self.vertices[self.root]) + " are:")
-        for i in range(len(self.costs)):
-            self.printPath(i) # Print a path from i to the source
-            print("(cost: " + str(self.costs[i]) + ")") # Path cost
+        self.writeAllPaths(sys.stdout)
+
+    # Write the paths from all vertices to the source, in the format of
+    # printAllPaths, to a file name or an open text file. The paths are
+    # built with getPaths and written in blocks of linesPerWrite lines,
+    # one block at a time, so memory is bounded by the block size
+    def writeAllPaths(self, file, linesPerWrite = 4096):
+        if isinstance(file, str):
+            with open(file, "w") as outfile:
+                self.writeAllPaths(outfile, linesPerWrite)
+            return
+
+        root = str(self.vertices[self.root])
+        file.write("All shortest paths from " + root + " are:\n")
+        for start in range(0, len(self.costs), linesPerWrite):
+            indices = range(start, min(start + linesPerWrite, len(self.costs)))
+            lines = []
+            for i, path in zip(indices, self.getPaths(indices)):
+                lines.append("A path from " + root + " to " + str(path[0])
+                    + ": " + " ".join(str(v) for v in reversed(path))
+                    + " (cost: " + str(self.costs[i]) + ")\n")
+            file.write("".join(lines))
 
 
 def test_shortest_path(): 
@@ -233,4 +679,5 @@ def test_shortest_path():
     tree2 = graph2.getShortestPath(3)
     tree2.printAllPaths()
 
-test_shortest_path()
+if __name__ == "__main__":
+    test_shortest_path()
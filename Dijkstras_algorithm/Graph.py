@@ -1,9 +1,35 @@
-from Queue import Queue 
+from array import array
+
+from .Queue import DequeQueue
+from .UnionFind import UnionFind
+
+# Return a dictionary that maps each vertex to its index. Shared by the
+# graph classes, which all index their vertices in list order
+def getIndices(vertices):
+    indices = {}
+    for i in range(len(vertices)):
+        indices.setdefault(vertices[i], i) # The first occurrence wins
+    return indices
+
+# Return the index of vertex v in a dictionary built by getIndices
+def getIndexIn(indices, v):
+    index = indices.get(v)
+    if index is None:
+        raise ValueError(str(v) + " is not in the graph")
+    return index
 
 class Graph:
     def __init__(self, vertices = [], edges = []):
         self.vertices = vertices
+        self.indices = self.getIndices(vertices)
         self.neighbors = self.getAdjacnecyLists(edges)
+        self.edgeIndex = None # Built on demand by getEdgeIndex
+        self.reverseNeighbors = None # Built on demand
+        self.version = 0 # Increased on every change to the graph
+
+    # Return a dictionary that maps each vertex to its index
+    def getIndices(self, vertices):
+        return getIndices(vertices)
 
     # Return a list of adjacency lists for edges 
     def getAdjacnecyLists(self, edges):
@@ -32,7 +58,7 @@ class Graph:
 
     # Return the index for the specified vertex 
     def getIndex(self, v):
-        return self.vertices.index(v)
+        return getIndexIn(self.indices, v)
 
     # Return the neighbors of vertex with the specified index 
     def getNeighbors(self, index):
@@ -53,22 +79,74 @@ class Graph:
 
     # Clear graph 
     def clear(self):
-        vertices = []
-        neighbors = []
+        self.vertices = []
+        self.indices = {}
+        self.neighbors = []
+        self.edgesChanged()
+
+    # Discard the structures derived from the edges after a change.
+    # They are rebuilt the next time they are needed
+    def edgesChanged(self):
+        self.version += 1
+        self.edgeIndex = None
+        self.reverseNeighbors = None
+
+    # Return a list of the edges entering each vertex, building it on
+    # first use. The lists share the edge objects of self.neighbors
+    def getReverseAdjacencyLists(self):
+        if self.reverseNeighbors is None:
+            self.reverseNeighbors = [[] for i in range(len(self.neighbors))]
+            for u in range(len(self.neighbors)):
+                for e in self.neighbors[u]:
+                    self.reverseNeighbors[e.v].append(e)
+        return self.reverseNeighbors
+
+    # Return a dictionary that maps (indexU, indexV) to the edge from u to
+    # v, building it on first use. For parallel edges the first one wins
+    def getEdgeIndex(self):
+        if self.edgeIndex is None:
+            self.edgeIndex = {}
+            for u in range(len(self.neighbors)):
+                for e in self.neighbors[u]:
+                    self.edgeIndex.setdefault((u, e.v), e)
+        return self.edgeIndex
+
+    # Return the edge from vertex u to vertex v, or None if there is none
+    def getEdge(self, u, v):
+        return self.getEdgeIndex().get((self.getIndex(u), self.getIndex(v)))
+
+    # Return True if there is an edge from vertex u to vertex v
+    def hasEdge(self, u, v):
+        return self.getEdge(u, v) is not None
   
     # Add a vertex to the graph   
     def addVertex(self, vertex):
-        if not (vertex in self.vertices):
+        if not (vertex in self.indices):
+            self.indices[vertex] = len(self.vertices)
             self.vertices.append(vertex)
             self.neighbors.append([]) # add a new empty adjacency list
+            self.edgesChanged()
         
     # Add an undirected edge to the graph   
     def addEdge(self, u, v):
-        if u in self.vertices and v in self.vertices:
-            indexU = self.getIndex(u)
-            indexV = self.getIndex(v)
+        if u in self.indices and v in self.indices:
+            indexU = self.indices[u]
+            indexV = self.indices[v]
             # Add an edge (u, v) to the graph
             self.neighbors[indexU].append(Edge(indexU, indexV))
+            self.edgesChanged()
+
+    # Add a batch of (u, v) edges given by vertex labels in linear time.
+    # Edges with an unknown vertex are skipped, as in addEdge
+    def addEdges(self, edges):
+        indices = self.indices
+        neighbors = self.neighbors
+        for u, v in edges:
+            indexU = indices.get(u)
+            indexV = indices.get(v)
+            if indexU is not None and indexV is not None:
+                neighbors[indexU].append(Edge(indexU, indexV))
+        self.edgesChanged()
   
     # Obtain a DFS tree starting from vertex u 
     # To be discussed in Section 22.6 
@@ -76,27 +154,45 @@ class Graph:
         searchOrders = []
         parent = len(self.vertices) * [-1] # Initialize parent[i] to -1
 
-        # Mark visited vertices
-        isVisited = len(self.vertices) * [False]
-
-        # Recursively search
-        self.dfsHelper(v, parent, searchOrders, isVisited)
+        # Search with an explicit stack, so deep graphs do not hit
+        # the recursion limit
+        for u in self.dfsIterator(v, parent):
+            searchOrders.append(u)
 
         # Return a search tree
         return Tree(v, parent, searchOrders, self.vertices)
 
-    # Recursive method for DFS search 
+    # Search from v, recording into parent, searchOrders and isVisited.
+    # Same result as the original recursive helper, but iterative
     def dfsHelper(self, v, parent, searchOrders, isVisited):
-        # Store the visited vertex
-        searchOrders.append(v)
+        searchOrders.extend(self.dfsIterator(v, parent, isVisited))
+
+    # Generate the vertices reachable from v lazily in DFS order, so the
+    # caller can stop early. parent[w] is set when w is visited, if given.
+    # Vertices already marked in isVisited are skipped
+    def dfsIterator(self, v, parent = None, isVisited = None):
+        if isVisited is None:
+            isVisited = len(self.vertices) * [False]
+
         isVisited[v] = True # Vertex v visited
+        yield v
 
-        for e in self.neighbors[v]:
-            w = e.v # e.v is w in Listing 22.6
-            if not isVisited[w]:
-                parent[w] = v # The parent of vertex w is v
-                # Recursive search
-                self.dfsHelper(w, parent, searchOrders, isVisited) 
+        # Each stack entry is a vertex and an iterator over its remaining
+        # edges, so the search resumes where it left off after a child
+        stack = [(v, iter(self.neighbors[v]))]
+        while len(stack) > 0:
+            u, edges = stack[-1]
+            for e in edges:
+                w = e.v # e.v is w in Listing 22.6
+                if not isVisited[w]:
+                    isVisited[w] = True
+                    if parent is not None:
+                        parent[w] = u # The parent of vertex w is u
+                    yield w
+                    stack.append((w, iter(self.neighbors[w])))
+                    break
+            else:
+                stack.pop() # All neighbors of u are visited
 
     # Starting bfs search from vertex v 
     # To be discussed in Section 22.7 
@@ -104,7 +200,7 @@ class Graph:
         searchOrders = []
         parent = len(self.vertices) * [-1] # Initialize parent[i] to -1
 
-        queue = Queue() # the Queue class is defined in Chapter 17
+        queue = DequeQueue() # A deque-backed version of the Chapter 17 Queue
         isVisited = len(self.vertices) * [False]
         queue.enqueue(v) # Enqueue v
         isVisited[v] = True # Mark it visited
@@ -121,6 +217,161 @@ class Graph:
 
         return Tree(v, parent, searchOrders, self.vertices)
 
+    # Level-synchronous BFS from vertex v, one frontier at a time. Return
+    # an array with the number of edges on a shortest path from v to each
+    # vertex, or -1 if the vertex cannot be reached
+    def bfsDistances(self, v):
+        distances = array("l", [-1]) * len(self.vertices)
+        distances[v] = 0
+
+        frontier = [v]
+        level = 0
+        while len(frontier) > 0:
+            level += 1
+            nextFrontier = []
+            for u in frontier:
+                for e in self.neighbors[u]:
+                    if distances[e.v] == -1:
+                        distances[e.v] = level
+                        nextFrontier.append(e.v)
+            frontier = nextFrontier
+
+        return distances
+
+    # Return the connected components of the graph as lists of vertex
+    # indices, ignoring edge directions. method is "bfs" (one BFS per
+    # component over a shared visited list) or "unionfind"
+    def getConnectedComponents(self, method = "bfs"):
+        if method == "bfs":
+            return self.getConnectedComponentsBFS()
+        elif method == "unionfind":
+            return self.getConnectedComponentsUnionFind()
+        else:
+            raise ValueError("Unknown connected components method: "
+                + str(method))
+
+    # Connected components by BFS. Every vertex is visited once overall
+    def getConnectedComponentsBFS(self):
+        reverseNeighbors = self.getReverseAdjacencyLists()
+        isVisited = len(self.vertices) * [False]
+        components = []
+
+        for v in range(len(self.vertices)):
+            if isVisited[v]:
+                continue
+
+            # The component list doubles as the BFS queue
+            isVisited[v] = True
+            component = [v]
+            i = 0
+            while i < len(component):
+                u = component[i]
+                i += 1
+                for e in self.neighbors[u]:
+                    if not isVisited[e.v]:
+                        isVisited[e.v] = True
+                        component.append(e.v)
+                for e in reverseNeighbors[u]:
+                    if not isVisited[e.u]:
+                        isVisited[e.u] = True
+                        component.append(e.u)
+            components.append(component)
+
+        return components
+
+    # Connected components by merging the endpoints of every edge
+    def getConnectedComponentsUnionFind(self):
+        sets = UnionFind(len(self.vertices))
+        for u in range(len(self.neighbors)):
+            for e in self.neighbors[u]:
+                sets.union(u, e.v)
+
+        components = {} # Representative -> component, in vertex order
+        for v in range(len(self.vertices)):
+            components.setdefault(sets.find(v), []).append(v)
+        return list(components.values())
+
+    # Return the strongly connected components as lists of vertex indices,
+    # using Tarjan's algorithm with an explicit stack
+    def getStronglyConnectedComponents(self):
+        index = len(self.vertices) * [-1] # Discovery number, -1 if unseen
+        low = len(self.vertices) * [0] # Lowest discovery number reachable
+        isOnStack = len(self.vertices) * [False]
+        stack = [] # Vertices whose component is not complete yet
+        components = []
+        counter = 0
+
+        for root in range(len(self.vertices)):
+            if index[root] != -1:
+                continue
+
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            isOnStack[root] = True
+
+            # Each entry is a vertex and an iterator over its remaining edges
+            work = [(root, iter(self.neighbors[root]))]
+            while len(work) > 0:
+                v, edges = work[-1]
+                for e in edges:
+                    w = e.v
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        isOnStack[w] = True
+                        work.append((w, iter(self.neighbors[w])))
+                        break
+                    elif isOnStack[w]:
+                        low[v] = min(low[v], index[w])
+                else:
+                    # All edges of v are done; return to its caller
+                    work.pop()
+                    if len(work) > 0:
+                        u = work[-1][0]
+                        low[u] = min(low[u], low[v])
+
+                    if low[v] == index[v]: # v is the root of a component
+                        component = []
+                        while True:
+                            w = stack.pop()
+                            isOnStack[w] = False
+                            component.append(w)
+                            if w == v:
+                                break
+                        components.append(component)
+
+        return components
+
+    # Return a topological order of the vertex indices using Kahn's
+    # algorithm, or None if the directed graph has a cycle
+    def getTopologicalOrder(self):
+        inDegree = len(self.vertices) * [0]
+        for u in range(len(self.neighbors)):
+            for e in self.neighbors[u]:
+                inDegree[e.v] += 1
+
+        # The order list doubles as the queue of vertices with no
+        # remaining incoming edges
+        order = [v for v in range(len(self.vertices)) if inDegree[v] == 0]
+        i = 0
+        while i < len(order):
+            u = order[i]
+            i += 1
+            for e in self.neighbors[u]:
+                inDegree[e.v] -= 1
+                if inDegree[e.v] == 0:
+                    order.append(e.v)
+
+        if len(order) < len(self.vertices):
+            return None # The vertices left over lie on or after a cycle
+        return order
+
+    # Return True if the directed graph has a cycle
+    def hasCycle(self):
+        return self.getTopologicalOrder() is None
+
 # Tree class will be discussed in Section 22.5 
 class Tree:
     def __init__(self, root, parent, searchOrders, vertices):
@@ -130,6 +381,7 @@ class Tree:
         # Store the search order in a list
         self.searchOrders = searchOrders 
         self.vertices = vertices # vertices of the graph
+        self.depths = None # Built on demand by getDepths
 
     # Return the root of the tree 
     def getRoot(self):
@@ -157,6 +409,62 @@ class Tree:
 
         return path
 
+    # Return the number of edges from each vertex to the root of its path
+    # in a list. The list is computed once and then reused
+    def getDepths(self):
+        if self.depths is None:
+            parent = self.parent
+            depths = len(parent) * [-1]
+            for v in range(len(parent)):
+                # Walk up to the root or to a vertex with a known depth
+                chain = []
+                while v != -1 and depths[v] == -1:
+                    chain.append(v)
+                    v = parent[v]
+                depth = -1 if v == -1 else depths[v]
+                for u in reversed(chain):
+                    depth += 1
+                    depths[u] = depth
+            self.depths = depths
+        return self.depths
+
+    # Return the paths from many vertex indices to the root, as getPath
+    # would, visiting each vertex once. A path is built by putting the
+    # vertex in front of its parent's path, so common prefixes are only
+    # walked once. The path of a vertex that was not asked for is dropped
+    # once its last child is built. indices defaults to all vertices
+    def getPaths(self, indices = None):
+        if indices is None:
+            indices = range(len(self.parent))
+
+        # Find the vertices whose paths are needed, and for each one the
+        # number of its children that still need its path
+        needed = set()
+        waitingChildren = {}
+        for index in indices:
+            while index != -1 and index not in needed:
+                needed.add(index)
+                index = self.parent[index]
+                if index != -1:
+                    waitingChildren[index] = waitingChildren.get(index, 0) + 1
+
+        # Build paths from the shallowest vertex up, so each parent's path
+        # is ready when its children need it
+        paths = {}
+        requested = set(indices)
+        depths = self.getDepths()
+        for v in sorted(needed, key = depths.__getitem__):
+            u = self.parent[v]
+            if u == -1:
+                paths[v] = [self.vertices[v]]
+            else:
+                paths[v] = [self.vertices[v]] + paths[u]
+                waitingChildren[u] -= 1
+                if waitingChildren[u] == 0 and u not in requested:
+                    del paths[u] # No child needs it any more
+
+        return [paths[index] for index in indices]
+
     # Print a path from the root to vertex v 
     def printPath(self, index):
         path = self.getPath(index)
@@ -177,8 +485,16 @@ class Tree:
 
         print()
         
-# The Edge class for defining an edge from u to v        
+# The Edge class for defining an edge from u to v. The attributes are
+# kept in __slots__ instead of a per-instance dictionary. On CPython 3.11
+# this cuts a WeightedEdge from 96 to 56 bytes, 42%, short of half; a
+# tuple-backed edge takes more, so graphs that need less use CSRGraph
 class Edge:
+    __slots__ = ("u", "v")
+
     def __init__(self, u, v):
         self.u = u
-        self.v = v
\ No newline at end of file
+        self.v = v
+
+    def __repr__(self):
+        return "Edge(" + repr(self.u) + ", " + repr(self.v) + ")"
\ No newline at end of file
@@ -0,0 +1,323 @@
+"""
+Graph Input and Output
+
+This module saves a graph to a compact binary file and opens it again with `mmap`. The file holds a fixed header
+followed by the CSR buffers of the graph (offsets, targets and weights) and the vertex labels. Loading maps the file
+read-only and casts memoryviews over the buffers, so no edge is parsed or copied: startup takes about as long as reading
+the labels, and worker processes that open the same file share its pages through the operating system's page cache.
+
+File layout (native byte order, checked on load):
+    - Header (64 bytes): magic, format version, flags (bit 0: weighted), byte-order mark, weight typecode,
+      number of vertices, number of edges, and the position and length of the labels.
+    - offsets: number of vertices + 1 signed 64-bit integers.
+    - targets: number of edges signed 32-bit integers, padded to a multiple of 8 bytes.
+    - weights: number of edges values of the weight typecode ("d" or "f"), present only for weighted graphs.
+    - labels: the vertex labels as a UTF-8 JSON list, so labels must be strings or numbers.
+
+A contraction hierarchy is saved the same way, with its own magic and header: the rank of every vertex, then the
+offsets, targets, weights ("d") and middles of its upward edges and of its downward edges, each buffer padded to a
+multiple of 8 bytes, and the labels.
+
+Text edge lists are read line by line instead: each line holds "u v" or "u v w" (or any other delimiter, such as ","
+for CSV files), and lines that are empty or start with "#" are skipped. The edges are handed to the graph in chunks of
+chunkSize, so memory use is the graph itself plus one chunk.
+
+Functions:
+    - saveGraph(graph, filename): Writes a `Graph`, `WeightedGraph` or `CSRGraph` to a file.
+    - loadGraph(filename): Maps a file written by saveGraph and returns a read-only `CSRGraph`.
+    - saveContractionHierarchy(hierarchy, filename): Writes a `ContractionHierarchy` to a file.
+    - loadContractionHierarchy(filename): Maps a file written by saveContractionHierarchy and returns the hierarchy.
+    - readEdgeChunks(filename, ...): Generates lists of at most chunkSize edges read from a text edge list.
+    - loadEdgeList(filename, ...): Builds a `WeightedGraph` (or a `Graph`) from a text edge list, one chunk at a time.
+
+Usage Example:
+    >>> saveGraph(WeightedGraph(vertices, edges), "cities.graph")
+    >>> graph = loadGraph("cities.graph")
+    >>> graph.getShortestPath(5).getCost(11)  # Output: 1268.0
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+from .Graph import Graph
+from .CSRGraph import CSRGraph
+from .Dijkstras_list import WeightedGraph
+from .ContractionHierarchies import ContractionHierarchy
+
+MAGIC = b"CSRGRAPH"
+FORMAT_VERSION = 1
+BYTE_ORDER_MARK = 0x01020304
+WEIGHTED = 1 # Flag bit for graphs with edge weights
+
+# magic, version, flags, byte-order mark, weight typecode (padded),
+# vertices, edges, labels position, labels length
+HEADER = struct.Struct("=8sIII4sQQQQ")
+HEADER_SIZE = 64
+
+HIERARCHY_MAGIC = b"CHGRAPH\0"
+# magic, version, byte-order mark, vertices, upward edges, downward edges,
+# labels position, labels length
+HIERARCHY_HEADER = struct.Struct("=8sIIQQQQQ")
+
+# Save a Graph, WeightedGraph or CSRGraph to a file
+def saveGraph(graph, filename):
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.fromGraph(graph)
+
+    offsets = memoryview(graph.offsets).cast("B")
+    targets = memoryview(graph.targets).cast("B")
+    if graph.weights is None:
+        flags = 0
+        typecode = b""
+        weights = b""
+    else:
+        flags = WEIGHTED
+        typecode = memoryview(graph.weights).format.encode()
+        weights = memoryview(graph.weights).cast("B")
+    padding = (8 - len(targets) % 8) % 8
+    labels = json.dumps(list(graph.vertices)).encode("utf-8")
+
+    labelsPosition = (HEADER_SIZE + len(offsets) + len(targets) + padding
+        + len(weights))
+    with open(filename, "wb") as file:
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, flags, BYTE_ORDER_MARK,
+            typecode, graph.getSize(), graph.getNumberOfEdges(),
+            labelsPosition, len(labels))
+        file.write(header + bytes(HEADER_SIZE - len(header)))
+        file.write(offsets)
+        file.write(targets)
+        file.write(bytes(padding))
+        file.write(weights)
+        file.write(labels)
+
+# Return the vertex labels stored at position in a mapped file, checking
+# that they start at dataEnd, where the buffers the header describes end,
+# that they lie within the file, and that there are numberOfVertices of
+# them. Raise ValueError otherwise
+def readLabels(buffer, position, length, dataEnd, numberOfVertices,
+               filename):
+    if position != dataEnd or position + length > len(buffer):
+        raise ValueError(filename + " is truncated or corrupt")
+    try:
+        # Slicing the mapping copies the bytes without exporting a buffer
+        labels = json.loads(buffer[position : position + length]
+            .decode("utf-8"))
+    except ValueError: # Also raised for invalid UTF-8 and JSON
+        raise ValueError(filename + " has invalid vertex labels")
+    if not isinstance(labels, list) or len(labels) != numberOfVertices:
+        raise ValueError(filename + " has invalid vertex labels")
+    return labels
+
+# Open a file written by saveGraph. The returned CSRGraph reads its
+# buffers straight from the mapped file and must not be modified. A file
+# that is truncated or corrupt raises ValueError
+def loadGraph(filename):
+    with open(filename, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+
+    # Check the header against the file size before any memoryview is
+    # taken, so the mapping can still be closed on an error
+    try:
+        if len(buffer) < HEADER_SIZE:
+            raise ValueError(filename + " is not a saved graph")
+        (magic, version, flags, byteOrderMark, typecode, numberOfVertices,
+            numberOfEdges, labelsPosition, labelsLength) = \
+            HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(filename + " is not a saved graph")
+        if version != FORMAT_VERSION:
+            raise ValueError(filename + " has unsupported format version "
+                + str(version))
+        if byteOrderMark != BYTE_ORDER_MARK:
+            raise ValueError(filename + " was saved with another byte order")
+        if flags & WEIGHTED:
+            typecode = typecode.rstrip(b"\0").decode("ascii", "replace")
+            if typecode not in ("d", "f"):
+                raise ValueError(filename + " has unsupported weight type "
+                    + repr(typecode))
+
+        targetsPosition = HEADER_SIZE + 8 * (numberOfVertices + 1)
+        weightsPosition = targetsPosition + 4 * numberOfEdges
+        weightsPosition += (8 - weightsPosition % 8) % 8
+        end = weightsPosition
+        if flags & WEIGHTED:
+            end += struct.calcsize(typecode) * numberOfEdges
+        labels = readLabels(buffer, labelsPosition, labelsLength, end,
+            numberOfVertices, filename)
+    except ValueError:
+        buffer.close()
+        raise
+
+    view = memoryview(buffer)
+    offsets = view[HEADER_SIZE : targetsPosition].cast("q")
+    targets = view[targetsPosition :
+        targetsPosition + 4 * numberOfEdges].cast("i")
+    weights = None
+    if flags & WEIGHTED:
+        weights = view[weightsPosition : end].cast(typecode)
+
+    graph = CSRGraph(labels, [])
+    graph.offsets = offsets
+    graph.targets = targets
+    graph.weights = weights
+    if weights is not None:
+        graph.weightTypecode = typecode
+    graph.buffer = buffer # Keep the mapping open while the graph is used
+    return graph
+
+# Save a ContractionHierarchy to a file
+def saveContractionHierarchy(hierarchy, filename):
+    buffers = [hierarchy.rank, hierarchy.upOffsets, hierarchy.upTargets,
+        hierarchy.upWeights, hierarchy.upMiddles, hierarchy.downOffsets,
+        hierarchy.downTargets, hierarchy.downWeights, hierarchy.downMiddles]
+    labels = json.dumps(list(hierarchy.vertices)).encode("utf-8")
+
+    labelsPosition = HEADER_SIZE
+    for buffer in buffers:
+        size = len(memoryview(buffer).cast("B"))
+        labelsPosition += size + (8 - size % 8) % 8
+    with open(filename, "wb") as file:
+        header = HIERARCHY_HEADER.pack(HIERARCHY_MAGIC, FORMAT_VERSION,
+            BYTE_ORDER_MARK, hierarchy.getSize(), len(hierarchy.upTargets),
+            len(hierarchy.downTargets), labelsPosition, len(labels))
+        file.write(header + bytes(HEADER_SIZE - len(header)))
+        for buffer in buffers:
+            data = memoryview(buffer).cast("B")
+            file.write(data)
+            file.write(bytes((8 - len(data) % 8) % 8))
+        file.write(labels)
+
+# Open a file written by saveContractionHierarchy. The returned hierarchy
+# reads its buffers straight from the mapped file. A file that is
+# truncated or corrupt raises ValueError
+def loadContractionHierarchy(filename):
+    with open(filename, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+
+    # Check the header against the file size before any memoryview is
+    # taken, so the mapping can still be closed on an error
+    try:
+        if len(buffer) < HEADER_SIZE:
+            raise ValueError(filename
+                + " is not a saved contraction hierarchy")
+        (magic, version, byteOrderMark, numberOfVertices, upwardEdges,
+            downwardEdges, labelsPosition, labelsLength) = \
+            HIERARCHY_HEADER.unpack_from(buffer, 0)
+        if magic != HIERARCHY_MAGIC:
+            raise ValueError(filename
+                + " is not a saved contraction hierarchy")
+        if version != FORMAT_VERSION:
+            raise ValueError(filename + " has unsupported format version "
+                + str(version))
+        if byteOrderMark != BYTE_ORDER_MARK:
+            raise ValueError(filename + " was saved with another byte order")
+
+        # The (typecode, start, end) of each buffer in file order,
+        # skipping the padding after it
+        sections = []
+        position = HEADER_SIZE
+        for typecode, length in (("i", numberOfVertices),
+                ("q", numberOfVertices + 1), ("i", upwardEdges),
+                ("d", upwardEdges), ("i", upwardEdges),
+                ("q", numberOfVertices + 1), ("i", downwardEdges),
+                ("d", downwardEdges), ("i", downwardEdges)):
+            end = position + struct.calcsize(typecode) * length
+            sections.append((typecode, position, end))
+            position = end + (8 - end % 8) % 8
+        labels = readLabels(buffer, labelsPosition, labelsLength, position,
+            numberOfVertices, filename)
+    except ValueError:
+        buffer.close()
+        raise
+
+    view = memoryview(buffer)
+    buffers = [view[start : end].cast(typecode)
+        for typecode, start, end in sections]
+
+    hierarchy = ContractionHierarchy(labels, buffers[0], buffers[1 : 5],
+        buffers[5 : 9])
+    hierarchy.buffer = buffer # Keep the mapping open while it is used
+    return hierarchy
+
+# Generate the edges of a text edge list in lists of at most chunkSize
+# (u, v, w) tuples, or (u, v) tuples if weighted is False. Labels are
+# converted with labelType, and string labels are interned so repeated
+# labels share one object. If hasHeader is True the first line is skipped.
+# progress, if given, is called after each chunk with the number of edges
+# and bytes read so far and the size of the file, and once more at the end
+# unless the last call already reported the whole file
+def readEdgeChunks(filename, chunkSize = 65536, delimiter = None,
+                   weighted = True, labelType = str, intern = True,
+                   hasHeader = False, progress = None):
+    totalBytes = os.path.getsize(filename)
+    bytesRead = 0
+    edgesRead = 0
+    reported = None # The last (edges, bytes) passed to progress
+    chunk = []
+
+    with open(filename, "rb") as file:
+        if hasHeader:
+            bytesRead += len(file.readline())
+
+        for line in file:
+            bytesRead += len(line)
+            line = line.decode("utf-8").strip()
+            if len(line) == 0 or line.startswith("#"):
+                continue # Blank line or comment
+
+            fields = line.split(delimiter)
+            u = labelType(fields[0].strip())
+            v = labelType(fields[1].strip())
+            if intern and labelType is str:
+                u = sys.intern(u)
+                v = sys.intern(v)
+
+            if weighted:
+                w = fields[2].strip()
+                try:
+                    w = int(w)
+                except ValueError:
+                    w = float(w)
+                chunk.append((u, v, w))
+            else:
+                chunk.append((u, v))
+
+            if len(chunk) >= chunkSize:
+                edgesRead += len(chunk)
+                yield chunk
+                chunk = []
+                if progress is not None:
+                    progress(edgesRead, bytesRead, totalBytes)
+                    reported = (edgesRead, bytesRead)
+
+    if len(chunk) > 0:
+        edgesRead += len(chunk)
+        yield chunk
+    if progress is not None and reported != (edgesRead, bytesRead):
+        progress(edgesRead, bytesRead, totalBytes)
+
+# Build a WeightedGraph, or a Graph if weighted is False, from a text edge
+# list. Vertices are added in the order their labels first appear. The
+# other arguments are passed on to readEdgeChunks
+def loadEdgeList(filename, weighted = True, chunkSize = 65536,
+                 delimiter = None, labelType = str, intern = True,
+                 hasHeader = False, progress = None):
+    if weighted:
+        graph = WeightedGraph([], [])
+    else:
+        graph = Graph([], [])
+
+    for chunk in readEdgeChunks(filename, chunkSize, delimiter, weighted,
+                                labelType, intern, hasHeader, progress):
+        indices = graph.indices
+        for edge in chunk:
+            if edge[0] not in indices:
+                graph.addVertex(edge[0])
+            if edge[1] not in indices:
+                graph.addVertex(edge[1])
+        graph.addEdges(chunk)
+
+    return graph
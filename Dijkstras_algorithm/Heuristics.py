@@ -0,0 +1,42 @@
+"""
+Distance Heuristics for A* Search
+
+Each function takes a list of per-vertex coordinates and returns a heuristic h(u, v) that estimates the cost of the
+path from vertex index u to vertex index v. For A* to return shortest paths the estimate must never exceed the real
+path cost, so the coordinates must use the same units as the edge weights.
+
+Functions:
+    - euclidean(coordinates): Straight-line distance between (x, y) points.
+    - haversine(coordinates, radius): Great-circle distance between (latitude, longitude) points in degrees.
+
+Usage Example:
+    >>> coordinates = [(47.61, -122.33), (37.77, -122.42)]  # Seattle, San Francisco
+    >>> h = haversine(coordinates)
+    >>> round(h(0, 1))  # Output: 680 (miles)
+"""
+
+import math
+
+EARTH_RADIUS_MILES = 3958.8
+EARTH_RADIUS_KM = 6371.0
+
+# Return a heuristic giving the straight-line distance between two vertices
+def euclidean(coordinates):
+    def heuristic(u, v):
+        return math.dist(coordinates[u], coordinates[v])
+    return heuristic
+
+# Return a heuristic giving the great-circle distance between two vertices
+# on a sphere of the given radius. The default radius is in miles
+def haversine(coordinates, radius = EARTH_RADIUS_MILES):
+    # Convert to radians once instead of on every call
+    radians = [(math.radians(lat), math.radians(lon))
+        for lat, lon in coordinates]
+
+    def heuristic(u, v):
+        lat1, lon1 = radians[u]
+        lat2, lon2 = radians[v]
+        a = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1)
+            * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+        return 2 * radius * math.asin(min(1.0, math.sqrt(a)))
+    return heuristic
@@ -1,4 +1,6 @@
-from LinkedList import LinkedList
+from collections import deque
+
+from .LinkedList import LinkedList
 
 class Queue:
     def __init__(self):
@@ -25,4 +27,33 @@ class Queue:
 
     # Return true if queue is empty 
     def isEmpty(self):
-        return self.getSize() == 0
\ No newline at end of file
+        return self.getSize() == 0
+
+# A queue with the same interface, backed by collections.deque. Elements
+# are kept in contiguous blocks, so enqueue does not allocate a Node
+class DequeQueue:
+    def __init__(self):
+        self.__elements = deque()
+
+    # Adds an element to this queue
+    def enqueue(self, e):
+        self.__elements.append(e)
+
+    # Removes an element from this queue
+    def dequeue(self):
+        if len(self.__elements) == 0:
+            return None
+        else:
+            return self.__elements.popleft()
+
+    # Return the size of the queue
+    def getSize(self):
+        return len(self.__elements)
+
+    # Returns a string representation of the queue
+    def __str__(self):
+        return "[" + ", ".join(str(e) for e in self.__elements) + "]"
+
+    # Return true if queue is empty
+    def isEmpty(self):
+        return len(self.__elements) == 0
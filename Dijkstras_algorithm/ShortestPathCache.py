@@ -0,0 +1,100 @@
+"""
+Least-Recently-Used Cache of Shortest Path Trees
+
+This class keeps the most recently used `ShortestPathTree` objects keyed by source vertex, so repeated queries from the
+same sources do not rerun Dijkstra's algorithm. Every lookup passes the current version of the graph; when it differs
+from the version the entries were computed for, the graph has changed and the whole cache is dropped.
+
+The cache is bounded by the number of entries and, optionally, by an estimate of the memory held by the cached trees.
+
+Methods:
+    - get(key, version): Returns the cached tree for key, or None.
+    - put(key, tree, version): Stores a tree, evicting the least recently used ones if a bound is exceeded.
+    - clear(): Drops all entries.
+    - getStatistics(): Returns the hit, miss, eviction and invalidation counts and the current size.
+
+Usage Example:
+    >>> graph.enableShortestPathCache(maxEntries = 256)
+    >>> tree = graph.getShortestPath(5)  # Miss: computed and cached
+    >>> tree = graph.getShortestPath(5)  # Hit
+    >>> graph.getShortestPathCache().getStatistics()["hits"]  # Output: 1
+"""
+
+from collections import OrderedDict
+import sys
+
+class ShortestPathCache:
+    def __init__(self, maxEntries = 128, maxBytes = None):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes # No memory bound if None
+        self.entries = OrderedDict() # key -> (tree, estimated bytes)
+        self.totalBytes = 0
+        self.version = None # Graph version the entries were computed for
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # Return the cached tree for key, or None if it is not cached
+    def get(self, key, version):
+        self.checkVersion(version)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key) # Now the most recently used
+        self.hits += 1
+        return entry[0]
+
+    # Store a tree computed for the given graph version
+    def put(self, key, tree, version):
+        self.checkVersion(version)
+        if key in self.entries:
+            self.totalBytes -= self.entries.pop(key)[1]
+
+        size = self.getEstimatedSize(tree)
+        self.entries[key] = (tree, size)
+        self.totalBytes += size
+
+        # Evict the least recently used trees until within the bounds
+        while len(self.entries) > self.maxEntries or (
+                self.maxBytes is not None and self.totalBytes > self.maxBytes
+                and len(self.entries) > 1):
+            oldKey, (oldTree, oldSize) = self.entries.popitem(last = False)
+            self.totalBytes -= oldSize
+            self.evictions += 1
+
+    # Drop all entries if the graph has changed since they were stored
+    def checkVersion(self, version):
+        if version != self.version:
+            if len(self.entries) > 0:
+                self.invalidations += 1
+            self.clear()
+            self.version = version
+
+    # Drop all entries
+    def clear(self):
+        self.entries.clear()
+        self.totalBytes = 0
+
+    # Return an estimate of the memory held by a tree: its lists plus
+    # one float object per cost
+    def getEstimatedSize(self, tree):
+        size = sys.getsizeof(tree.parent) + sys.getsizeof(tree.searchOrders)
+        costs = getattr(tree, "costs", None)
+        if costs is not None:
+            size += sys.getsizeof(costs) + len(costs) * sys.getsizeof(0.0)
+        return size
+
+    # Return the number of cached trees
+    def getSize(self):
+        return len(self.entries)
+
+    # Return the cache statistics in a dictionary
+    def getStatistics(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self.entries), "bytes": self.totalBytes}
@@ -0,0 +1,59 @@
+"""
+Union-Find (Disjoint Set) Implementation
+
+This class keeps track of a partition of the vertices 0 .. size - 1 into disjoint sets. It is used by Kruskal's algorithm to
+decide in near-constant time whether an edge joins two different trees.
+
+Methods:
+    - find(x): Returns the representative of the set containing x.
+    - union(x, y): Merges the sets containing x and y. Returns True if they were different sets.
+    - isConnected(x, y): Returns True if x and y are in the same set.
+    - getNumberOfSets(): Returns the number of disjoint sets.
+
+Usage Example:
+    >>> sets = UnionFind(4)
+    >>> sets.union(0, 1)  # Output: True
+    >>> sets.union(1, 0)  # Output: False
+    >>> sets.isConnected(0, 1)  # Output: True
+    >>> sets.getNumberOfSets()  # Output: 3
+"""
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size)) # Each element starts in its own set
+        self.rank = size * [0] # Upper bound on the height of each set
+        self.numberOfSets = size
+
+    # Return the representative of the set containing x
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]] # Path halving
+            x = parent[x]
+        return x
+
+    # Merge the sets containing x and y
+    # Return False if x and y are already in the same set
+    def union(self, x, y):
+        rootX = self.find(x)
+        rootY = self.find(y)
+        if rootX == rootY:
+            return False
+
+        # Attach the shorter tree under the taller one
+        if self.rank[rootX] < self.rank[rootY]:
+            rootX, rootY = rootY, rootX
+        self.parent[rootY] = rootX
+        if self.rank[rootX] == self.rank[rootY]:
+            self.rank[rootX] += 1
+
+        self.numberOfSets -= 1
+        return True
+
+    # Return True if x and y are in the same set
+    def isConnected(self, x, y):
+        return self.find(x) == self.find(y)
+
+    # Return the number of disjoint sets
+    def getNumberOfSets(self):
+        return self.numberOfSets
@@ -1,26 +1,56 @@
-from Graph import Edge
+from .Graph import Edge
 
+# The WeightedEdge class for an edge from u to v with a weight. Edges are
+# ordered by (weight, u, v), so the lightest edge is the smallest and
+# WeightedEdge objects can be pushed on a heapq min-heap or sorted directly
 class WeightedEdge(Edge):
+    __slots__ = ("weight",)
+
     def __init__(self, u, v, weight):
         super().__init__(u, v)
         self.weight = weight # The weight on edge (u, v)
 
+    # Return the key the edges are ordered by
+    def getKey(self):
+        return (self.weight, self.u, self.v)
+
     # Overload the comparison operators
-    # Note we purposely reverse the order
-    def __lt__(self, other): 
-        return self.weight > other.weight 
-        
+    def __lt__(self, other):
+        if not isinstance(other, WeightedEdge):
+            return NotImplemented
+        return self.getKey() < other.getKey()
+
     def __le__(self, other):
-        return self.weight >= other.weight 
-        
+        if not isinstance(other, WeightedEdge):
+            return NotImplemented
+        return self.getKey() <= other.getKey()
+
     def __gt__(self, other):
-        return self.weight < other.weight 
+        if not isinstance(other, WeightedEdge):
+            return NotImplemented
+        return self.getKey() > other.getKey()
 
     def __ge__(self, other):
-        return self.weight <= other.weight 
+        if not isinstance(other, WeightedEdge):
+            return NotImplemented
+        return self.getKey() >= other.getKey()
 
+    # Equal edges have the same key, so equality agrees with the ordering
     def __eq__(self, other):
-        return self.weight == other.weight 
+        if not isinstance(other, WeightedEdge):
+            return NotImplemented
+        return self.getKey() == other.getKey()
 
     def __ne__(self, other):
-        return self.weight != other.weight 
\ No newline at end of file
+        if not isinstance(other, WeightedEdge):
+            return NotImplemented
+        return self.getKey() != other.getKey()
+
+    # The hash changes with setWeight, so do not modify the weight of an
+    # edge while it is a set member or a dictionary key
+    def __hash__(self):
+        return hash(self.getKey())
+
+    def __repr__(self):
+        return ("WeightedEdge(" + repr(self.u) + ", " + repr(self.v) + ", "
+            + repr(self.weight) + ")")
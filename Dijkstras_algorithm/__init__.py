@@ -0,0 +1,69 @@
+"""
+Graph Algorithms Package
+
+Importing the package loads only the core graph classes. The optional engines (binary graph files, batch shortest paths
+and contraction hierarchies) are imported the first time one of their names is used, so a service that only needs
+`WeightedGraph` does not pay for `multiprocessing`, `mmap` or `json` at startup. The benchmarks are not exported; they
+run as `python -m Dijkstras_algorithm.Benchmark` and are loaded only then.
+
+Core classes:
+    - Graph, Tree, Edge: Unweighted graphs and search trees (Graph.py).
+    - WeightedGraph, MST, ShortestPathTree: Weighted graphs and their algorithms (Dijkstras_list.py).
+    - WeightedEdge, UnionFind, ShortestPathCache.
+    - CSRGraph: Compressed sparse row graphs (CSRGraph.py).
+
+Imported on first use:
+    - saveGraph, loadGraph, readEdgeChunks, loadEdgeList (GraphIO.py)
+    - saveContractionHierarchy, loadContractionHierarchy (GraphIO.py)
+    - ContractionHierarchy (ContractionHierarchies.py)
+    - getDistanceMatrix, DistanceMatrix (BatchShortestPaths.py)
+
+Usage Example:
+    >>> from Dijkstras_algorithm import WeightedGraph
+    >>> graph = WeightedGraph(["A", "B", "C"], [[0, 1, 5], [1, 2, 3]])
+    >>> graph.getShortestPath(0).getCost(2)  # Output: 8
+
+The demo from the textbook runs with:
+    python -m Dijkstras_algorithm
+"""
+
+import importlib
+
+from .Graph import Graph
+from .Graph import Tree
+from .Graph import Edge
+from .WeightedEdge import WeightedEdge
+from .UnionFind import UnionFind
+from .ShortestPathCache import ShortestPathCache
+from .Dijkstras_list import WeightedGraph
+from .Dijkstras_list import MST
+from .Dijkstras_list import ShortestPathTree
+from .Dijkstras_list import INFINITY
+from .CSRGraph import CSRGraph
+
+# Name -> module that defines it, for the names imported on first use
+lazyNames = {
+    "saveGraph": "GraphIO",
+    "loadGraph": "GraphIO",
+    "readEdgeChunks": "GraphIO",
+    "loadEdgeList": "GraphIO",
+    "saveContractionHierarchy": "GraphIO",
+    "loadContractionHierarchy": "GraphIO",
+    "ContractionHierarchy": "ContractionHierarchies",
+    "getDistanceMatrix": "BatchShortestPaths",
+    "DistanceMatrix": "BatchShortestPaths",
+}
+
+__all__ = ["Graph", "Tree", "Edge", "WeightedEdge", "UnionFind",
+    "ShortestPathCache", "WeightedGraph", "MST", "ShortestPathTree",
+    "INFINITY", "CSRGraph"] + list(lazyNames)
+
+# Import an optional engine the first time one of its names is used
+def __getattr__(name):
+    if name in lazyNames:
+        module = importlib.import_module("." + lazyNames[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value # Later lookups skip __getattr__
+        return value
+    raise AttributeError("module " + repr(__name__) + " has no attribute "
+        + repr(name))
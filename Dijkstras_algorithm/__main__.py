@@ -0,0 +1,8 @@
+"""
+Run the textbook demo of the graph algorithms:
+    python -m Dijkstras_algorithm
+"""
+
+from .Dijkstras_list import test_shortest_path
+
+test_shortest_path()
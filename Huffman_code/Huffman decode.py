@@ -3,11 +3,58 @@ Huffman Coding with Encoding and Decoding
 
 This program implements Huffman coding to compress and decompress text. It builds a Huffman tree based on character frequencies, generates binary codes for each character, and encodes or decodes text using the tree.
 
+The alphabet is either the 256 byte values or the Unicode code points. encodeBytes codes any bytes, and encodeText codes
+the UTF-8 bytes of a text by default, so every character is supported with a 256-symbol alphabet. With
+codePoints=True, encodeText codes whole characters instead, which compresses better when the text uses many
+multi-byte characters. The decoding table grows by 256 entries per character, so code points are only used for text
+with at most MAX_CODE_POINT_SYMBOLS (1024) distinct characters; text with more is coded as UTF-8 bytes, and the header
+records which alphabet was used. Counting runs in C: `numpy.bincount` when NumPy is installed and
+`collections.Counter` otherwise.
+
+The codes are canonical: the Huffman tree only supplies the code length of each character, limited to 15 bits, and the
+codes follow from the lengths, as integers assigned in order of length and then of character. The header therefore
+stores just the lengths, and the decoder builds its tables from them without a tree.
+
+The encoder packs the codes into bytes, eight code bits per byte, behind that header. Each block of text is mapped to
+its code bits with `str.translate` and packed with `int(bits, 2).to_bytes`, so the work per character runs in C instead
+of in a Python loop.
+
+Encoded layout (little-endian header):
+    - magic b"HUF3", the alphabet (BYTES, UTF8 or CODE_POINTS), the number of padding bits in the last byte and the
+      number of symbols: bytes for BYTES and UTF8, characters for CODE_POINTS.
+    - For the byte alphabets, the code length of each of the 256 bytes, 0 if it does not occur, two 4-bit lengths per
+      byte. For CODE_POINTS, the number of characters that occur, then a 32-bit code point | length << 24 for each.
+    - The code bits of the text, most significant bit first, with the last byte padded with zero bits.
+
+decodeText is table driven. The proper prefixes of the codes are the states of a machine that reads a whole byte of
+code bits per step: one lookup gives every character the byte completes and the next state. The table has 256 entries
+per state, so at most 255 * 256 for bytes. decodeTextByTree walks the tree one bit at a time instead, and
+`python "Huffman decode.py" --benchmark [file]` compares the decoders in MB/s.
+
+compress and decompress work on files of any size in bounded memory. The input is read in blocks of CHUNK_SIZE bytes,
+and each block is coded with its own code lengths, so only one block is held at a time and the output is written as
+it is produced. Files and pipes work as well as paths, since the input is read only once. Stream layout:
+    - magic b"HUFS" and the block size.
+    - For each block, its encoded size as a 32-bit little-endian integer followed by the block as written by
+      encodeBytes.
+    - An encoded size of 0 ends the stream, so a truncated stream is detected.
+
 Functions:
-    - getCharacterFrequency(text): Computes character frequencies from the input text.
+    - getCharacterFrequency(text): Computes character frequencies from the input text, indexed by code point.
+    - getByteFrequency(data): Computes the frequencies of the 256 byte values.
     - getHuffmanTree(counts): Builds a Huffman tree from character frequencies.
-    - getCode(root): Generates Huffman codes from the tree.
+    - getCode(root): Generates Huffman codes from the tree, as a dictionary from character to code.
+    - getCodeLengths(counts, maxLength): Returns the code length of each character, at most maxLength bits.
+    - getCanonicalCodes(lengths): Returns the canonical codes, as integers, for the code lengths.
     - decode(text, huffman_tree): Decodes a binary string back to the original text using the Huffman tree.
+    - encodeBytes(data): Encodes bytes into bytes: a header followed by the packed code bits.
+    - encodeText(text, codePoints): Encodes text, as UTF-8 bytes or as code points.
+    - decodeBytes(data): Decodes bytes written by encodeBytes, one byte per table lookup.
+    - decodeText(data): Decodes bytes written by encodeText back to the original text.
+    - decodeTextByTree(data): Decodes the same bytes by walking the tree bit by bit.
+    - compress(src, dst, blockSize): Compresses a file or binary stream block by block.
+    - decompress(src, dst): Decompresses a file or binary stream written by compress.
+    - benchmarkDecoders(text): Returns the throughput of each decoder in MB/s.
 
 Classes:
     - Tree: Represents the Huffman tree.
@@ -15,16 +62,51 @@ Classes:
 
 Usage:
     - Input a string to encode.
-    - View the encoded binary string and its decoded form.
+    - View the Huffman codes, the size of the encoded bytes and the decoded text.
+    - python "Huffman decode.py" --compress source destination, and --decompress likewise; "-" is standard
+      input or output.
 """
 
+import collections
+import contextlib
+import os
+import random
+import struct
+import sys
+import time
+
 from heap import Heap
 
+MAGIC = b"HUF3"
+# magic, alphabet, padding bits, number of symbols
+HEADER = struct.Struct("<4sBBQ")
+# Alphabets
+BYTES = 0 # Any bytes
+UTF8 = 1 # The UTF-8 bytes of a text
+CODE_POINTS = 2 # The characters of a text
+ALPHABET_SIZE = 256 # Byte values
+MAX_CODE_POINT = 0x10FFFF
+# The most distinct characters coded as code points. Each one adds about
+# 256 decoding table entries, some 35 MB in all at this limit
+MAX_CODE_POINT_SYMBOLS = 1024
+MAX_CODE_LENGTH = 15 # Code lengths fit in 4 bits
+BLOCK_SIZE = 1 << 16 # Characters packed per step
+
+STREAM_MAGIC = b"HUFS"
+# magic, block size
+STREAM_HEADER = struct.Struct("<4sI")
+# Encoded size of a block, 0 at the end of the stream
+BLOCK_HEADER = struct.Struct("<I")
+CHUNK_SIZE = 1 << 20 # Bytes of input coded per block
+
 def getCode(root):
     if root == None: 
         return None    
-    codes = 128 * [0]
-    assignCode(root, codes)
+    codes = {} # Character -> code
+    if root.left == None:
+        codes[root.element] = "0" # A single character still needs a bit
+    else:
+        assignCode(root, codes)
     return codes
   
 # Recursively get codes to the leaf node 
@@ -36,7 +118,7 @@ def assignCode(root, codes):
         root.right.code = root.code + "1"
         assignCode(root.right, codes)
     else:
-        codes[ord(root.element)] = root.code
+        codes[root.element] = root.code
   
 # Get a Huffman tree from the codes   
 def getHuffmanTree(counts):
@@ -53,14 +135,26 @@ def getHuffmanTree(counts):
 
     return heap.remove() # The final tree
   
-# Get the frequency of the characters 
+# Get the frequency of the characters, indexed by code point up to the
+# largest one in text
 def getCharacterFrequency(text):
-    counts = 128 * [0] # 128 ASCII characters
-    
-    for i in range(len(text)):
-        counts[ord(text[i])] += 1 # Count the characters in text
-    
+    frequencies = collections.Counter(text) # Counted in C
+    counts = (max(map(ord, frequencies)) + 1 if frequencies else 0) * [0]
+    for character, count in frequencies.items():
+        counts[ord(character)] = count
     return counts
+    
+# Get the frequency of each of the 256 byte values in data
+def getByteFrequency(data):
+    try:
+        import numpy
+    except ImportError:
+        counts = ALPHABET_SIZE * [0]
+        for byte, count in collections.Counter(data).items():
+            counts[byte] = count
+        return counts
+    return numpy.bincount(numpy.frombuffer(data, dtype = numpy.uint8),
+        minlength = ALPHABET_SIZE).tolist()
   
 # Define a Huffman coding tree 
 class Tree:
@@ -73,19 +167,19 @@ class Tree:
             self.root.right = t2.root
             self.root.weight = t1.root.weight + t2.root.weight
     
-    # Overload the comparison operators
-    # Note we purposely reverse the order
+    # Overload the comparison operators, so the Heap removes the tree
+    # with the smallest weight first
     def __lt__(self, other): 
-        return self.root.weight > other.root.weight 
-        
+        return self.root.weight < other.root.weight
+
     def __le__(self, other):
-        return self.root.weight >= other.root.weight 
-        
-    def __gt__(self, other):
-        return self.root.weight < other.root.weight 
+        return self.root.weight <= other.root.weight
 
+    def __gt__(self, other):
+        return self.root.weight > other.root.weight 
+        
     def __ge__(self, other):
-        return self.root.weight <= other.root.weight 
+        return self.root.weight >= other.root.weight 
 
 class Node:
     # Create a node with the specified weight and character 
@@ -113,28 +207,480 @@ def decode(text, huffman_tree):
     
     return decoded_text
 
+# Return the code length of every character: the depth of its leaf in the
+# Huffman tree, limited to maxLength bits. Characters that do not occur
+# have length 0
+def getCodeLengths(counts, maxLength = 15):
+    lengths = len(counts) * [0]
+    tree = getHuffmanTree(counts)
+    if tree == None:
+        return lengths # No characters
+    if tree.root.left == None:
+        lengths[ord(tree.root.element)] = 1 # A single character needs a bit
+        return lengths
+
+    stack = [(tree.root, 0)]
+    while len(stack) > 0:
+        node, depth = stack.pop()
+        if node.left == None:
+            lengths[ord(node.element)] = depth
+        else:
+            stack.append((node.left, depth + 1))
+            stack.append((node.right, depth + 1))
+
+    if max(lengths) > maxLength:
+        limitCodeLengths(lengths, counts, maxLength)
+    return lengths
+
+# Shorten the codes longer than maxLength bits. The lengths of a prefix
+# code satisfy the Kraft inequality, sum(2 ** -length) <= 1, which cutting
+# long codes breaks; it is restored by lengthening the codes of the rarest
+# characters, and any room left over shortens the most frequent codes
+def limitCodeLengths(lengths, counts, maxLength):
+    symbols = [i for i in range(len(lengths)) if lengths[i] > 0]
+    if len(symbols) > 1 << maxLength:
+        raise ValueError(str(len(symbols)) + " characters do not fit in "
+            + str(maxLength) + "-bit codes")
+    symbols.sort(key = lambda i: (counts[i], lengths[i])) # Rarest first
+
+    # The Kraft sum, in units of 2 ** -maxLength
+    capacity = 1 << maxLength
+    total = 0
+    for i in symbols:
+        lengths[i] = min(lengths[i], maxLength)
+        total += 1 << (maxLength - lengths[i])
+
+    while total > capacity:
+        for i in symbols:
+            if lengths[i] < maxLength:
+                lengths[i] += 1
+                total -= 1 << (maxLength - lengths[i])
+                if total <= capacity:
+                    break
+
+    for i in reversed(symbols):
+        while lengths[i] > 1 and \
+                total + (1 << (maxLength - lengths[i])) <= capacity:
+            total += 1 << (maxLength - lengths[i])
+            lengths[i] -= 1
+
+# Return the canonical Huffman codes, as integers, for the given code
+# lengths. Codes are assigned in order of length, then of character, each
+# one the previous code plus one, shifted left when the length grows. The
+# decoder can rebuild them from the lengths alone
+def getCanonicalCodes(lengths):
+    codes = len(lengths) * [0]
+    code = 0
+    previousLength = 0
+    for length, i in sorted((lengths[i], i) for i in range(len(lengths))
+            if lengths[i] > 0):
+        code <<= length - previousLength
+        codes[i] = code
+        code += 1
+        previousLength = length
+    return codes
+
+# Pack the codes of the characters in text into bytes. Return the bytes and
+# the number of zero bits padding the last byte
+def packBits(text, codes, lengths):
+    table = {}
+    for i in range(len(codes)):
+        if lengths[i] > 0:
+            # Maps a character to its code bits
+            table[i] = format(codes[i], "0" + str(lengths[i]) + "b")
+
+    packed = bytearray()
+    pending = "" # Code bits left over from the previous block
+    for start in range(0, len(text), BLOCK_SIZE):
+        bits = pending + text[start : start + BLOCK_SIZE].translate(table)
+        usable = len(bits) - len(bits) % 8
+        if usable > 0:
+            packed += int(bits[: usable], 2).to_bytes(usable // 8, "big")
+        pending = bits[usable :]
+
+    padding = (8 - len(pending)) % 8
+    if len(pending) > 0:
+        packed += int(pending + padding * "0", 2).to_bytes(1, "big")
+    return packed, padding
+
+# Return the code lengths of an alphabet as bytes: two 4-bit lengths per
+# byte for the 256 bytes, or the number of characters that occur followed
+# by code point | length << 24 for each
+def packCodeLengths(mode, lengths):
+    if mode != CODE_POINTS:
+        lengths = lengths + (ALPHABET_SIZE - len(lengths)) * [0]
+        return bytes(lengths[i] << 4 | lengths[i + 1]
+            for i in range(0, ALPHABET_SIZE, 2))
+    entries = [i | lengths[i] << 24 for i in range(len(lengths))
+        if lengths[i] > 0]
+    return struct.pack("<I" + str(len(entries)) + "I", len(entries),
+        *entries)
+
+# Read code lengths written by packCodeLengths at position in data. Return
+# the lengths, indexed by symbol, and the position after them
+def unpackCodeLengths(data, position, mode):
+    lengths = []
+    if mode != CODE_POINTS:
+        for byte in data[position : position + ALPHABET_SIZE // 2]:
+            lengths.append(byte >> 4)
+            lengths.append(byte & 15)
+        if len(lengths) < ALPHABET_SIZE:
+            raise ValueError("Huffman encoded data is truncated")
+        return lengths, position + ALPHABET_SIZE // 2
+
+    if len(data) < position + 4:
+        raise ValueError("Huffman encoded data is truncated")
+    count, = struct.unpack_from("<I", data, position)
+    if len(data) < position + 4 + 4 * count:
+        raise ValueError("Huffman encoded data is truncated")
+    entries = struct.unpack_from("<" + str(count) + "I", data, position + 4)
+    # Check the entries before the list sized by the largest code point
+    for entry in entries:
+        if entry & 0xFFFFFF > MAX_CODE_POINT or entry >> 24 > MAX_CODE_LENGTH:
+            raise ValueError("Invalid code length in Huffman encoded data")
+    if len(entries) > 0:
+        lengths = (max(entry & 0xFFFFFF for entry in entries) + 1) * [0]
+    for entry in entries:
+        lengths[entry & 0xFFFFFF] = entry >> 24
+    return lengths, position + 4 + 4 * count
+
+# Encode text, whose characters are the symbols of the alphabet, with the
+# given symbol counts: a header with the code lengths, then the packed bits
+# of the canonical codes
+def encodeSymbols(text, counts, mode):
+    lengths = getCodeLengths(counts, MAX_CODE_LENGTH)
+    codes = getCanonicalCodes(lengths)
+    packed, padding = packBits(text, codes, lengths)
+    return HEADER.pack(MAGIC, mode, padding, len(text)) \
+        + packCodeLengths(mode, lengths) + packed
+
+# Encode bytes into bytes over the alphabet of the 256 byte values
+def encodeBytes(data, mode = BYTES):
+    counts = getByteFrequency(data) # Count frequency
+    # Latin-1 maps each byte to the character with the same code point
+    return encodeSymbols(bytes(data).decode("latin-1"), counts, mode)
+
+# Encode text into bytes. The UTF-8 bytes of the text are coded by default;
+# with codePoints=True the characters themselves are, unless the text has
+# more than MAX_CODE_POINT_SYMBOLS distinct characters
+def encodeText(text, codePoints = False):
+    if codePoints:
+        counts = getCharacterFrequency(text) # Count frequency
+        if len(counts) - counts.count(0) <= MAX_CODE_POINT_SYMBOLS:
+            return encodeSymbols(text, counts, CODE_POINTS)
+    return encodeBytes(text.encode("utf-8"), UTF8)
+
+# Read the header of bytes written by encodeBytes or encodeText. Return
+# the alphabet, the code length of every symbol, the number of symbols,
+# the number of padding bits and the position of the first code byte
+def readHeader(data):
+    if len(data) < HEADER.size:
+        raise ValueError("Huffman encoded data is truncated")
+    magic, mode, padding, size = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or mode not in (BYTES, UTF8, CODE_POINTS):
+        raise ValueError("Not Huffman encoded data")
+
+    lengths, position = unpackCodeLengths(data, HEADER.size, mode)
+    return mode, lengths, size, padding, position
+
+# Build the decoding table from the code lengths. Decoding is a state
+# machine whose states are the proper prefixes of the codes, the empty
+# prefix being state 0, and which reads one byte per step. Entry
+# state * 256 + byte holds the symbols that byte completes, as bytes, or
+# as a string if text is true, and the state after it, multiplied by 256 so
+# it can be added to the next byte. Entries for bits that no code
+# continues with are None
+def getDecodingTable(lengths, text = False):
+    codes = getCanonicalCodes(lengths)
+    characters = {} # (code, length) -> symbol
+    states = {(0, 0): 0} # (prefix, length) -> state
+    for i in range(len(lengths)):
+        if lengths[i] > 0:
+            characters[(codes[i], lengths[i])] = i
+            for length in range(1, lengths[i]):
+                prefix = (codes[i] >> (lengths[i] - length), length)
+                states.setdefault(prefix, len(states))
+
+    # Read four bits from each state, then join two such steps per byte
+    nibbles = len(states) * 16 * [None]
+    for (prefix, prefixLength), state in states.items():
+        for nibble in range(16):
+            output = []
+            code, length = prefix, prefixLength
+            for j in range(3, -1, -1):
+                code = 2 * code + ((nibble >> j) & 1)
+                length += 1
+                if (code, length) in characters:
+                    output.append(characters[(code, length)])
+                    code, length = 0, 0
+                elif (code, length) not in states:
+                    break # No code continues with this bit
+            else:
+                output = "".join(map(chr, output)) if text else bytes(output)
+                nibbles[16 * state + nibble] = (output, states[(code, length)])
+
+    table = []
+    for state in range(len(states)):
+        for byte in range(256):
+            high = nibbles[16 * state + (byte >> 4)]
+            if high == None:
+                table.append(None)
+                continue
+            low = nibbles[16 * high[1] + (byte & 15)]
+            if low == None:
+                table.append(None)
+            else:
+                table.append((high[0] + low[0], 256 * low[1]))
+    return table
+
+# Decode the code bytes of data from position on, with the decoding table
+# for the lengths, into size symbols. Each step looks up a whole byte of
+# code bits in the table and emits all the symbols it completes at once,
+# so no Python code runs per bit. Return bytes, or a string if text is true
+def decodeSymbols(data, position, lengths, size, text = False):
+    table = getDecodingTable(lengths, text)
+
+    # Growing the output is faster than writing slices into a buffer
+    # pre-sized from the header, which measured under half the speed
+    output = [] if text else bytearray()
+    state = 0
+    try:
+        if text:
+            append = output.append # Strings are joined once at the end
+            for byte in data[position :]:
+                characters, state = table[state + byte]
+                append(characters)
+            output = "".join(output)
+        else:
+            for byte in data[position :]:
+                characters, state = table[state + byte]
+                output += characters
+    except TypeError:
+        raise ValueError("Invalid code in Huffman encoded data")
+
+    if len(output) < size:
+        raise ValueError("Huffman encoded data is truncated")
+    # The padding bits may decode into extra symbols
+    return output[: size] if text else bytes(output[: size])
+
+# Decode bytes written by encodeBytes, or by encodeText without
+# codePoints, back to the original bytes
+def decodeBytes(data):
+    mode, lengths, size, padding, position = readHeader(data)
+    if mode == CODE_POINTS:
+        return decodeText(data).encode("utf-8")
+    return decodeSymbols(data, position, lengths, size)
+
+# Decode bytes written by encodeText back to the original text. Bytes
+# written by encodeBytes are decoded as Latin-1
+def decodeText(data):
+    mode, lengths, size, padding, position = readHeader(data)
+    if mode == CODE_POINTS:
+        return decodeSymbols(data, position, lengths, size, True)
+    decoded = decodeSymbols(data, position, lengths, size)
+    return decoded.decode("utf-8" if mode == UTF8 else "latin-1")
+
+# Build a Huffman tree with the canonical codes for the given lengths
+def getTreeFromCodes(lengths):
+    codes = getCanonicalCodes(lengths)
+    root = Node()
+    for i in range(len(lengths)):
+        node = root
+        for j in range(lengths[i] - 1, -1, -1):
+            if (codes[i] >> j) & 1 == 0:
+                if node.left == None:
+                    node.left = Node()
+                node = node.left
+            else:
+                if node.right == None:
+                    node.right = Node()
+                node = node.right
+        if lengths[i] > 0:
+            node.element = chr(i)
+    return Tree(root)
+
+# Decode bytes written by encodeText by walking the Huffman tree one bit
+# at a time. decodeText gives the same result faster
+def decodeTextByTree(data):
+    mode, lengths, size, padding, position = readHeader(data)
+    root = getTreeFromCodes(lengths).root
+
+    # Walk the tree bit by bit, one block of bytes at a time
+    characters = []
+    node = root
+    for start in range(position, len(data), BLOCK_SIZE):
+        block = data[start : start + BLOCK_SIZE]
+        bits = format(int.from_bytes(block, "big"),
+            "0" + str(8 * len(block)) + "b")
+        if start + BLOCK_SIZE >= len(data) and padding > 0:
+            bits = bits[: -padding] # Drop the padding bits
+        for bit in bits:
+            node = node.left if bit == "0" else node.right
+            if node.left == None and node.right == None:
+                characters.append(node.element)
+                node = root
+
+    if len(characters) != size:
+        raise ValueError("Expected " + str(size) + " characters, decoded "
+            + str(len(characters)))
+    if mode == UTF8: # The leaves hold bytes as Latin-1 characters
+        return "".join(characters).encode("latin-1").decode("utf-8")
+    return "".join(characters)
+
+# Return size characters of random text with the letter frequencies of
+# English, for benchmarks
+def getSampleText(size, seed = 0):
+    letters = " etaoinshrdlcumwfgypbvkjxqz"
+    weights = [18, 12, 9, 8, 7.5, 7, 6.7, 6.3, 6.1, 6, 4.3, 4, 2.8, 2.8, 2.4,
+        2.4, 2.2, 2, 2, 1.9, 1.5, 1, 0.8, 0.2, 0.2, 0.1, 0.1]
+    generator = random.Random(seed)
+    return "".join(generator.choices(letters, weights, k = size))
+
+# Time the decoders on text and return (decoder, MB/s) pairs, measured in
+# megabytes of decoded text per second, best of repeat runs
+def benchmarkDecoders(text, repeat = 3):
+    encoded = encodeText(text)
+    decoders = []
+    tree = getHuffmanTree(getCharacterFrequency(text))
+    # decode cannot walk a tree without branches, so text with fewer than
+    # two distinct characters is only timed with the other decoders
+    if tree != None and tree.root.left != None:
+        codes = getCode(tree.root)
+        bits = "".join([codes[char] for char in text])
+        decoders.append(("tree walk over a '0'/'1' string",
+            lambda: decode(bits, tree)))
+    decoders.append(("tree walk over bytes", lambda: decodeTextByTree(encoded)))
+    decoders.append(("byte table", lambda: decodeText(encoded)))
+    results = []
+    for name, decoder in decoders:
+        best = None
+        for i in range(repeat):
+            start = time.perf_counter()
+            if decoder() != text:
+                raise AssertionError(name + " decoded the text incorrectly")
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        results.append((name, len(text) / best / 1e6))
+    return results
+
+# Open file for reading or writing if it is a path. A file object is used
+# as it is and left open
+def openStream(file, mode):
+    if isinstance(file, (str, bytes, os.PathLike)):
+        return open(file, mode)
+    return contextlib.nullcontext(file)
+
+# Read exactly size bytes from a binary stream, fewer only at its end
+def readFully(input, size):
+    data = input.read(size)
+    while 0 < len(data) < size:
+        more = input.read(size - len(data))
+        if not more:
+            break
+        data += more
+    return data
+
+# Compress the file or binary stream src into dst, one block of blockSize
+# bytes at a time, each with its own code lengths. Memory use is bounded
+# by the block size, whatever the size of src. Return the number of bytes
+# read and written
+def compress(src, dst, blockSize = CHUNK_SIZE):
+    if not 0 < blockSize < 1 << 31:
+        raise ValueError("Invalid block size " + str(blockSize))
+    with openStream(src, "rb") as input, openStream(dst, "wb") as output:
+        output.write(STREAM_HEADER.pack(STREAM_MAGIC, blockSize))
+        read, written = 0, STREAM_HEADER.size
+        while True:
+            block = readFully(input, blockSize)
+            if not block:
+                break
+            encoded = encodeBytes(block)
+            output.write(BLOCK_HEADER.pack(len(encoded)))
+            output.write(encoded)
+            read += len(block)
+            written += BLOCK_HEADER.size + len(encoded)
+        output.write(BLOCK_HEADER.pack(0)) # End of the stream
+    return read, written + BLOCK_HEADER.size
+
+# Decompress the file or binary stream src, written by compress, into dst
+# one block at a time. Return the number of bytes read and written
+def decompress(src, dst):
+    with openStream(src, "rb") as input, openStream(dst, "wb") as output:
+        header = readFully(input, STREAM_HEADER.size)
+        if len(header) < STREAM_HEADER.size or \
+                STREAM_HEADER.unpack(header)[0] != STREAM_MAGIC:
+            raise ValueError("Not a Huffman compressed stream")
+        blockSize = STREAM_HEADER.unpack(header)[1]
+        # The largest block encodeBytes writes, so corrupt sizes cannot
+        # make a block read unbounded
+        maxSize = HEADER.size + ALPHABET_SIZE // 2 \
+            + (blockSize * MAX_CODE_LENGTH + 7) // 8
+        read, written = STREAM_HEADER.size, 0
+        while True:
+            header = readFully(input, BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                raise ValueError("Huffman compressed stream is truncated")
+            size, = BLOCK_HEADER.unpack(header)
+            read += BLOCK_HEADER.size
+            if size == 0:
+                break # End of the stream
+            if size > maxSize:
+                raise ValueError("Invalid block in Huffman compressed stream")
+            encoded = readFully(input, size)
+            if len(encoded) < size:
+                raise ValueError("Huffman compressed stream is truncated")
+            block = decodeBytes(encoded)
+            output.write(block)
+            read += size
+            written += len(block)
+    return read, written
+
 
 def main():
     text = input("Enter a text: ").strip()
     
     counts = getCharacterFrequency(text) # Count frequency
 
-    print(f"{'ASCII Code':<14s} {'Character':<14s}",
+    print(f"{'Code Point':<14s} {'Character':<14s}",
           f"{'Frequency':<14s} {'Code':<14s}")  
     
-    tree = getHuffmanTree(counts) # Create a Huffman tree
-    codes = getCode(tree.root) # Get codes
+    lengths = getCodeLengths(counts, MAX_CODE_LENGTH) # Get code lengths
+    codes = getCanonicalCodes(lengths) # Get codes
         
     for i in range(len(codes)):
         if counts[i] != 0: # (char)i is not in text if counts[i] is 0
+            code = format(codes[i], "0" + str(lengths[i]) + "b")
             print(f"{i:<14d} {chr(i):<14s}",
-                  f"{counts[i]:<14d} {codes[i]:<14s}")
+                  f"{counts[i]:<14d} {code:<14s}")
 
-    encoded_text = ''.join([codes[ord(char)] for char in text])
-    print("Encoded Text:", encoded_text)
+    encoded = encodeText(text, codePoints = True)
+    print("Encoded Bytes:", encoded.hex(" "))
+    print("Encoded Size:", len(encoded), "bytes for", len(text),
+          "characters")
     
-    decoded_text = decode(encoded_text, tree)
+    decoded_text = decodeText(encoded)
     print("Decoded Text:", decoded_text)
 
 
-main()
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        # python "Huffman decode.py" --benchmark [UTF-8 text file]
+        if len(sys.argv) > 2:
+            with open(sys.argv[2], encoding = "utf-8") as file:
+                text = file.read()
+        else:
+            text = getSampleText(1000000)
+        for name, throughput in benchmarkDecoders(text):
+            print(f"{name:<34s} {throughput:8.2f} MB/s")
+    elif len(sys.argv) == 4 and sys.argv[1] in ("--compress", "--decompress"):
+        # python "Huffman decode.py" --compress source destination
+        src = sys.stdin.buffer if sys.argv[2] == "-" else sys.argv[2]
+        dst = sys.stdout.buffer if sys.argv[3] == "-" else sys.argv[3]
+        if sys.argv[1] == "--compress":
+            read, written = compress(src, dst)
+        else:
+            read, written = decompress(src, dst)
+        print(read, "bytes in,", written, "bytes out", file = sys.stderr)
+    else:
+        main()